@@ -4,6 +4,8 @@ Modify these settings to customize the application behavior.
 """
 
 import os
+import json
+from dataclasses import dataclass, fields
 
 # Base directory (automatically detected)
 BASE_DIR = os.getcwd()
@@ -38,3 +40,110 @@ MAX_PCAP_FILE_SIZE_MB = 100  # Maximum PCAP file size to upload (in MB)
 AI_ANALYSIS_ENABLED = True  # Enable/disable AI-powered analysis
 AI_MAX_TOKENS = 2000  # Maximum tokens for AI response
 AI_TEMPERATURE = 0.7  # AI response creativity (0.0-1.0)
+AI_REQUEST_TIMEOUT = 30  # Seconds to wait for an AI provider before retrying
+AI_MAX_RETRIES = 2  # Retries after a timed-out AI request
+
+
+# Optional JSON file next to this one whose keys override the settings above,
+# e.g. {"max_events": 2000, "ai_analysis_enabled": false}
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+
+@dataclass(frozen=True)
+class Config:
+    """Snapshot of the user-tunable settings."""
+
+    report_dir: str = REPORT_DIR
+    user_log_dir: str = USER_LOG_DIR
+    upload_dir: str = UPLOAD_DIR
+    default_log_type: str = DEFAULT_LOG_TYPE
+    max_events: int = MAX_EVENTS
+    enable_json_export: bool = ENABLE_JSON_EXPORT
+    enable_csv_export: bool = ENABLE_CSV_EXPORT
+    enable_txt_export: bool = ENABLE_TXT_EXPORT
+    enable_html_export: bool = ENABLE_HTML_EXPORT
+    ai_analysis_enabled: bool = AI_ANALYSIS_ENABLED
+
+
+_config_cache = {"mtime": None, "config": None}
+
+# Spellings accepted for true/false settings given as strings
+_BOOL_STRINGS = {
+    "true": True,
+    "yes": True,
+    "1": True,
+    "false": False,
+    "no": False,
+    "0": False,
+}
+
+
+def _coerce(field, value):
+    """
+    Convert a config.json value to a Config field's type.
+
+    Raises:
+        ValueError: If the value does not fit the field
+    """
+    if field.type is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in _BOOL_STRINGS:
+            return _BOOL_STRINGS[value.strip().lower()]
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+    elif field.type is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value)
+    elif field.type is str:
+        if isinstance(value, str):
+            return value
+    raise ValueError(f"expected {field.type.__name__}, got {value!r}")
+
+
+def get_config():
+    """
+    Get the current settings, applying overrides from config.json.
+
+    The file is only re-read when its modification time changes, so edits
+    take effect without restarting. If the file becomes unreadable or does
+    not hold a JSON object, the last good settings (or the defaults) are
+    kept; a value of the wrong type falls back to that setting's default.
+    """
+    try:
+        mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    cached = _config_cache["config"]
+    if cached is not None and mtime == _config_cache["mtime"]:
+        return cached
+
+    overrides = {}
+    if mtime is not None:
+        try:
+            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+            if not isinstance(overrides, dict):
+                raise ValueError("expected a JSON object")
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring {CONFIG_FILE}: {e}")
+            overrides = {}
+            if cached is not None:
+                _config_cache["mtime"] = mtime
+                return cached
+
+    values = {}
+    for field in fields(Config):
+        if field.name in overrides:
+            try:
+                values[field.name] = _coerce(field, overrides[field.name])
+            except ValueError as e:
+                print(f"Warning: Ignoring {field.name} in {CONFIG_FILE}: {e}")
+    config = Config(**values)
+
+    _config_cache["mtime"] = mtime
+    _config_cache["config"] = config
+    return config
@@ -1,26 +1,8 @@
 # Unified main entry point for merged_analyzer
-from modules.log_collector import collect_windows_logs
-from modules.file_parser import parse_evtx_file, parse_csv_log, parse_json_log
-from modules.analyzer import detect_basic_anomalies
-from modules.utils import (
-    save_json_report,
-    save_csv_report,
-    save_text_summary,
-    save_html_report,
-    ensure_dir,
-    choose_log_file,
-)
-from modules.ai_analyzer import analyze_report_with_ai
-from modules.report_manager import manage_reports_menu, organize_reports
-from modules.pcap_uploader import list_files, delete_file
-from modules.pcap_analyzer import generate_report as auto_analyze_pcap
-from config import (
-    REPORT_DIR,
-    USER_LOG_DIR,
-    DEFAULT_LOG_TYPE,
-    UPLOAD_DIR,
-    AI_ANALYSIS_ENABLED,
-)
+# Analysis modules (pandas, pywin32, AI SDKs) are imported inside the menu
+# handlers that use them so startup only pays for the path the user picks.
+from modules.utils import save_all_reports, ensure_dir, choose_log_file
+from config import get_config
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
@@ -29,28 +11,59 @@ import os
 
 console = Console()
 
-
-def print_banner():
-    """Display application banner."""
-    banner = """
+# Static menu renderables are built once and reused on every loop iteration
+_BANNER_PANEL = Panel(
+    """
     ╔══════════════════════════════════════════════════════════════╗
     ║                                                              ║
     ║        UNIFIED LOG & PCAP ANALYZER v2.0                     ║
     ║        Windows Event Log & Network Traffic Analysis          ║
     ║                                                              ║
     ╚══════════════════════════════════════════════════════════════╝
-    """
-    console.print(Panel(banner, style="bold cyan"))
+    """,
+    style="bold cyan",
+)
+
+_MAIN_MENU = "\n".join(
+    [
+        "\n[bold cyan]Main Menu:[/bold cyan]",
+        "  [green]1.[/green] Automatic Windows Log Analysis (Live System)",
+        "  [green]2.[/green] Analyze a Log File from 'user_logs' Folder",
+        "  [green]3.[/green] PCAP Tools (Network Analysis)",
+        "  [green]4.[/green] Manage Reports (View/Delete/Organize)",
+        "  [green]5.[/green] Exit",
+    ]
+)
+
+
+_PCAP_MENU = "\n".join(
+    [
+        "\n[bold magenta]════ PCAP Analysis ════[/bold magenta]",
+        "  [cyan]1.[/cyan] List uploaded PCAP files",
+        "  [cyan]2.[/cyan] Automatic PCAP Analysis (Generate Report)",
+        "  [cyan]3.[/cyan] Delete a PCAP file",
+        "  [cyan]4.[/cyan] Back to main menu",
+    ]
+)
+
+
+def print_banner():
+    """Display application banner."""
+    console.print(_BANNER_PANEL)
 
 
 def run_automatic_analysis():
     """Run automatic Windows log analysis from live system."""
+    config = get_config()
     try:
+        from modules.log_collector import collect_windows_logs
+        from modules.analyzer import detect_basic_anomalies
+
         print(
             "\n[bold cyan]════ Running Automatic Windows Log Analysis ════[/bold cyan]"
         )
 
-        df = collect_windows_logs(DEFAULT_LOG_TYPE)
+        df = collect_windows_logs(config.default_log_type, max_events=config.max_events)
 
         if df is None or df.empty:
             print("[yellow]⚠️ No logs collected. Analysis skipped.[/yellow]")
@@ -64,12 +77,9 @@ def run_automatic_analysis():
         # All reports for the same analysis get the same number
         from modules.report_numbering import get_next_report_number
 
-        report_num = get_next_report_number(REPORT_DIR, "log_analysis")
+        report_num = get_next_report_number(config.report_dir, "log_analysis")
 
-        save_json_report(df, REPORT_DIR, report_number=report_num)
-        save_csv_report(df, REPORT_DIR, report_number=report_num)
-        save_text_summary(findings, REPORT_DIR, report_number=report_num)
-        save_html_report(df, findings, REPORT_DIR, report_number=report_num)
+        save_all_reports(df, findings, config.report_dir, report_number=report_num)
 
         # Display findings
         print("\n[bold yellow]════ Analysis Findings ════[/bold yellow]")
@@ -79,7 +89,7 @@ def run_automatic_analysis():
         print("\n[bold green]✓ Automatic analysis completed successfully![/bold green]")
 
         # Offer AI analysis
-        if AI_ANALYSIS_ENABLED:
+        if config.ai_analysis_enabled:
             ai_choice = (
                 input(
                     "\n[?] Would you like AI-powered analysis and remediation guidance? (y/n): "
@@ -88,8 +98,10 @@ def run_automatic_analysis():
                 .lower()
             )
             if ai_choice == "y":
+                from modules.ai_analyzer import analyze_report_with_ai
+
                 analyze_report_with_ai(
-                    df, findings, REPORT_DIR, report_number=report_num
+                    df, findings, config.report_dir, report_number=report_num
                 )
 
     except PermissionError:
@@ -104,13 +116,17 @@ def run_automatic_analysis():
 
 def run_file_analysis():
     """Run analysis on a user-provided log file."""
+    config = get_config()
     try:
         print("\n[bold cyan]════ File-Based Log Analysis ════[/bold cyan]")
 
-        file_path = choose_log_file(USER_LOG_DIR)
+        file_path = choose_log_file(config.user_log_dir)
         if not file_path:
             return
 
+        from modules.file_parser import parse_evtx_file, parse_csv_log, parse_json_log
+        from modules.analyzer import detect_basic_anomalies
+
         # Determine file type and parse accordingly
         file_ext = os.path.splitext(file_path)[1].lower()
 
@@ -138,12 +154,9 @@ def run_file_analysis():
         # All reports for the same analysis get the same number
         from modules.report_numbering import get_next_report_number
 
-        report_num = get_next_report_number(REPORT_DIR, "log_analysis")
+        report_num = get_next_report_number(config.report_dir, "log_analysis")
 
-        save_json_report(df, REPORT_DIR, report_number=report_num)
-        save_csv_report(df, REPORT_DIR, report_number=report_num)
-        save_text_summary(findings, REPORT_DIR, report_number=report_num)
-        save_html_report(df, findings, REPORT_DIR, report_number=report_num)
+        save_all_reports(df, findings, config.report_dir, report_number=report_num)
 
         # Display findings
         print("\n[bold yellow]════ Analysis Findings ════[/bold yellow]")
@@ -155,7 +168,7 @@ def run_file_analysis():
         )
 
         # Offer AI analysis
-        if AI_ANALYSIS_ENABLED:
+        if config.ai_analysis_enabled:
             ai_choice = (
                 input(
                     "\n[?] Would you like AI-powered analysis and remediation guidance? (y/n): "
@@ -164,8 +177,10 @@ def run_file_analysis():
                 .lower()
             )
             if ai_choice == "y":
+                from modules.ai_analyzer import analyze_report_with_ai
+
                 analyze_report_with_ai(
-                    df, findings, REPORT_DIR, report_number=report_num
+                    df, findings, config.report_dir, report_number=report_num
                 )
 
     except Exception as e:
@@ -176,13 +191,13 @@ def run_file_analysis():
 
 def run_pcap_tools():
     """PCAP tools submenu."""
+    from modules.pcap_uploader import list_files, prompt_delete_file
+    from modules.pcap_analyzer import generate_report as auto_analyze_pcap
+
     while True:
+        config = get_config()
         try:
-            print("\n[bold magenta]════ PCAP Analysis ════[/bold magenta]")
-            print("  [cyan]1.[/cyan] List uploaded PCAP files")
-            print("  [cyan]2.[/cyan] Automatic PCAP Analysis (Generate Report)")
-            print("  [cyan]3.[/cyan] Delete a PCAP file")
-            print("  [cyan]4.[/cyan] Back to main menu")
+            print(_PCAP_MENU)
 
             choice = input("\n[?] Enter your choice (1-4): ").strip()
 
@@ -198,16 +213,18 @@ def run_pcap_tools():
                             input("\nEnter file number to analyze: ").strip()
                         )
                         if 1 <= file_num <= len(files):
-                            pcap_path = os.path.join(UPLOAD_DIR, files[file_num - 1])
+                            pcap_path = os.path.join(
+                                config.upload_dir, files[file_num - 1]
+                            )
                             print(
                                 f"\n[cyan]Starting automatic analysis of {files[file_num - 1]}...[/cyan]"
                             )
                             report_file, report_num = auto_analyze_pcap(
-                                pcap_path, REPORT_DIR
+                                pcap_path, config.report_dir
                             )
 
                             # Offer AI analysis if enabled
-                            if report_file and AI_ANALYSIS_ENABLED:
+                            if report_file and config.ai_analysis_enabled:
                                 ai_choice = (
                                     input(
                                         "\n[?] Would you like AI-powered analysis and security insights? (y/n): "
@@ -225,7 +242,7 @@ def run_pcap_tools():
 
                                     analyze_pcap_with_ai(
                                         report_content,
-                                        REPORT_DIR,
+                                        config.report_dir,
                                         report_number=report_num,
                                     )
                         else:
@@ -234,7 +251,7 @@ def run_pcap_tools():
                         print("[red]Invalid input. Please enter a number.[/red]")
                 input("\nPress Enter to continue...")
             elif choice == "3":
-                delete_file()
+                prompt_delete_file()
                 input("\nPress Enter to continue...")
             elif choice == "4":
                 return
@@ -253,21 +270,16 @@ def main_menu():
     """Main application menu."""
     try:
         # Ensure required directories exist
-        ensure_dir(REPORT_DIR)
-        ensure_dir(USER_LOG_DIR)
-        ensure_dir(UPLOAD_DIR)
+        config = get_config()
+        ensure_dir(config.report_dir)
+        ensure_dir(config.user_log_dir)
+        ensure_dir(config.upload_dir)
 
         while True:
+            config = get_config()
             try:
                 print_banner()
-                print("\n[bold cyan]Main Menu:[/bold cyan]")
-                print(
-                    "  [green]1.[/green] Automatic Windows Log Analysis (Live System)"
-                )
-                print("  [green]2.[/green] Analyze a Log File from 'user_logs' Folder")
-                print("  [green]3.[/green] PCAP Tools (Network Analysis)")
-                print("  [green]4.[/green] Manage Reports (View/Delete/Organize)")
-                print("  [green]5.[/green] Exit")
+                print(_MAIN_MENU)
 
                 choice = input("\n[?] Enter your choice (1-5): ").strip()
 
@@ -278,10 +290,15 @@ def main_menu():
                 elif choice == "3":
                     run_pcap_tools()
                 elif choice == "4":
+                    from modules.report_manager import (
+                        manage_reports_menu,
+                        organize_reports,
+                    )
+
                     # Organize reports into subdirectories first
-                    organize_reports(REPORT_DIR)
+                    organize_reports(config.report_dir)
                     # Show report management menu
-                    manage_reports_menu(REPORT_DIR)
+                    manage_reports_menu(config.report_dir)
                 elif choice == "5":
                     print(
                         "\n[bold yellow]Thank you for using Log & PCAP Analyzer![/bold yellow]"
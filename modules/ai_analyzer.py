@@ -4,12 +4,21 @@ Supports multiple AI providers: OpenAI, Anthropic, Google Gemini, and Ollama (lo
 """
 
 import os
+import re
 import json
+import asyncio
+import functools
+import time
+import queue
+import threading
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 from datetime import datetime
+from config import AI_REQUEST_TIMEOUT, AI_MAX_RETRIES, AI_TEMPERATURE
+from modules.ai_cache import LLMCache
+from modules.ai_router import ProviderRouter
 
 # Load environment variables from .env file
 try:
@@ -21,219 +30,476 @@ except ImportError:
 
 console = Console()
 
+# Shared provider health, so later analyses start with a provider that works
+router = ProviderRouter()
+
+OLLAMA_URL = "http://localhost:11434"
+
+# Seconds to wait for a provider before retrying, and how many retries to allow.
+# Once a provider has some history the wait shrinks to 1.5x its recent p90
+# latency (see ProviderRouter.timeout), never exceeding these limits.
+REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", AI_REQUEST_TIMEOUT))
+MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", AI_MAX_RETRIES))
+
+# Local Ollama generation can legitimately take minutes before responding
+OLLAMA_GENERATE_TIMEOUT = 180
+
+# The Ollama liveness probe hits localhost, so it should answer almost at once.
+# Its result is reused for OLLAMA_PROBE_TTL seconds (longer when it failed).
+OLLAMA_PROBE_TIMEOUT = 0.5
+OLLAMA_PROBE_TTL = 60
+OLLAMA_PROBE_NEGATIVE_TTL = 300
+_ollama_probe = {"available": False, "expires": 0.0}
+
+# Seconds to wait on a provider before also asking the next configured one.
+# Unset, the wait is the provider's own request timeout (see
+# ProviderRouter.timeout), so a backup is only started once the first
+# provider has failed or is slower than its recent p90 latency allows.
+HEDGE_STAGGER = (
+    float(os.environ["AI_HEDGE_STAGGER"]) if os.getenv("AI_HEDGE_STAGGER") else None
+)
+
+# Sampling temperature sent to every provider
+TEMPERATURE = float(os.getenv("AI_TEMPERATURE", AI_TEMPERATURE))
+
+# Lines that stamp a prompt with the current time; they are left out of the
+# cache key so repeated analyses of the same report can hit the cache
+_PROMPT_TIMESTAMP_RE = re.compile(r"^(?:- \*\*Analysis Date\*\*|Generated): .*$", re.M)
+
+# Responses are only cached when they are reproducible (temperature 0),
+# unless AI_CACHE_FORCE=1 asks for caching anyway
+CACHE_TTL = int(os.getenv("AI_CACHE_TTL", "86400"))
+CACHE_FORCE = os.getenv("AI_CACHE_FORCE") == "1"
+
+# Skip rendering AI answers in the console (they are still saved to disk)
+QUIET = os.getenv("AI_QUIET") == "1"
+
+# Seconds between status checks while waiting on an OpenAI batch
+BATCH_POLL_INTERVAL = 30
+
+# API key environment variable -> provider, in order of preference
+API_KEY_VARS = {
+    "OPENAI_API_KEY": "openai",
+    "ANTHROPIC_API_KEY": "anthropic",
+    "GOOGLE_API_KEY": "gemini",
+}
+
+# Provider -> (model environment variable, default model)
+PROVIDER_MODELS = {
+    "openai": ("OPENAI_MODEL", "gpt-4o-mini"),  # gpt-4o-mini for cost efficiency
+    "anthropic": ("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022"),
+    "gemini": ("GOOGLE_MODEL", "gemini-flash-latest"),
+    "ollama": ("OLLAMA_MODEL", "llama3.2"),
+}
+
+# Instructions for each kind of analysis. `system` is used by providers with
+# a system prompt, `preamble` is prepended to the prompt for the others.
+LOG_ANALYSIS_TASK = {
+    "system": "You are a cybersecurity expert specializing in Windows event log analysis, incident response, and security remediation. Provide detailed, actionable analysis and recommendations.",
+    "preamble": "You are a cybersecurity expert. Analyze this security report:",
+    "max_tokens": 2000,
+}
+
+PCAP_ANALYSIS_TASK = {
+    "system": "You are a network security and cybersecurity expert specializing in traffic analysis, threat detection, and incident response. Provide detailed, actionable analysis.",
+    "preamble": "You are a network security and cybersecurity expert. Analyze this PCAP report:",
+    "max_tokens": 2500,
+}
+
+
+def _retry_on_timeout(call, timeout_errors):
+    """Run call(), retrying with exponential backoff if it times out."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return call()
+        except timeout_errors:
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(2**attempt)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_openai_client():
+    """Shared OpenAI client so HTTPS connections are reused between calls."""
+    import openai
+
+    return openai.OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        timeout=REQUEST_TIMEOUT,
+        max_retries=MAX_RETRIES,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_anthropic_client():
+    """Shared Anthropic client so HTTPS connections are reused between calls."""
+    import anthropic
+
+    return anthropic.Anthropic(
+        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        timeout=REQUEST_TIMEOUT,
+        max_retries=MAX_RETRIES,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_session():
+    """Shared keep-alive HTTP session for Ollama requests."""
+    import requests
+
+    return requests.Session()
+
 
 def get_ai_provider():
     """Determine which AI provider to use based on available API keys."""
-    providers = {
-        "OPENAI_API_KEY": "openai",
-        "ANTHROPIC_API_KEY": "anthropic",
-        "GOOGLE_API_KEY": "gemini",
-    }
+    forced = _forced_provider()
+    if forced:
+        return forced
 
-    for env_var, provider in providers.items():
+    for env_var, provider in API_KEY_VARS.items():
         if os.getenv(env_var):
             return provider
 
     # Check if Ollama is available (local)
-    try:
-        import requests
-
-        response = requests.get("http://localhost:11434/api/tags", timeout=2)
-        if response.status_code == 200:
-            return "ollama"
-    except:
-        pass
+    if _ollama_available():
+        return "ollama"
 
     return None
 
 
-def analyze_with_openai(report_data, findings):
-    """Analyze security report using OpenAI GPT models."""
-    try:
-        import openai
+def get_ai_providers():
+    """List every configured AI provider in order of preference."""
+    forced = _forced_provider()
+    if forced:
+        return [forced]
 
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            return (
-                None,
-                "OpenAI API key not found. Set OPENAI_API_KEY environment variable.",
-            )
+    providers = [
+        provider for env_var, provider in API_KEY_VARS.items() if os.getenv(env_var)
+    ]
+    if _ollama_available():
+        providers.append("ollama")
+    return providers
 
-        openai.api_key = api_key
-        model = os.getenv(
-            "OPENAI_MODEL", "gpt-4o-mini"
-        )  # Default to gpt-4o-mini for cost efficiency
 
-        prompt = create_analysis_prompt(report_data, findings)
+def _forced_provider():
+    """Get the provider named by AI_PROVIDER, if it is a known one."""
+    provider = os.getenv("AI_PROVIDER", "").strip().lower()
+    return provider if provider in PROVIDERS else None
 
-        print(f"[dim]Using OpenAI model: {model}[/dim]")
 
-        response = openai.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a cybersecurity expert specializing in Windows event log analysis, incident response, and security remediation. Provide detailed, actionable analysis and recommendations.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-            max_tokens=2000,
+def _ollama_available():
+    """Check whether a local Ollama server is answering (result is cached)."""
+    now = time.monotonic()
+    if _ollama_probe["expires"] > now:
+        return _ollama_probe["available"]
+
+    try:
+        response = _get_http_session().get(
+            f"{OLLAMA_URL}/api/tags", timeout=OLLAMA_PROBE_TIMEOUT
         )
+        available = response.status_code == 200
+    except:
+        available = False
 
-        return response.choices[0].message.content, None
+    # A failed probe costs the full timeout, so remember it for longer
+    ttl = OLLAMA_PROBE_TTL if available else OLLAMA_PROBE_NEGATIVE_TTL
+    _ollama_probe["available"] = available
+    _ollama_probe["expires"] = now + ttl
+    return available
 
-    except ImportError:
-        return None, "OpenAI library not installed. Run: pip install openai"
-    except Exception as e:
-        return None, f"OpenAI API error: {str(e)}"
 
+def get_model(provider):
+    """Get the configured model name for a provider."""
+    env_var, default = PROVIDER_MODELS[provider]
+    return os.getenv(env_var, default)
 
-def analyze_with_anthropic(report_data, findings):
-    """Analyze security report using Anthropic Claude models."""
-    try:
-        import anthropic
 
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            return (
-                None,
-                "Anthropic API key not found. Set ANTHROPIC_API_KEY environment variable.",
-            )
+def get_response_cache(report_dir):
+    """
+    Get the response cache for a report directory.
 
-        client = anthropic.Anthropic(api_key=api_key)
-        model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
+    Returns:
+        LLMCache, or None when responses are not deterministic enough to reuse
+    """
+    if TEMPERATURE != 0 and not CACHE_FORCE:
+        return None
+    return LLMCache(os.path.join(report_dir, ".ai_cache"), ttl=CACHE_TTL)
 
-        prompt = create_analysis_prompt(report_data, findings)
 
-        print(f"[dim]Using Anthropic model: {model}[/dim]")
+def _cache_key(provider, prompt, task):
+    """Build the response cache key for a prompt sent to a provider.
 
-        message = client.messages.create(
-            model=model,
-            max_tokens=2000,
-            temperature=0.7,
-            system="You are a cybersecurity expert specializing in Windows event log analysis, incident response, and security remediation. Provide detailed, actionable analysis and recommendations.",
-            messages=[{"role": "user", "content": prompt}],
-        )
+    Timestamp lines are stripped first, so the key only depends on the
+    report content, findings and task.
+    """
+    stable = _PROMPT_TIMESTAMP_RE.sub("", prompt)
+    return LLMCache.make_key(
+        provider, get_model(provider), f"{task['system']}\n{stable}"
+    )
 
-        return message.content[0].text, None
 
-    except ImportError:
-        return None, "Anthropic library not installed. Run: pip install anthropic"
-    except Exception as e:
-        return None, f"Anthropic API error: {str(e)}"
+def _call_openai(prompt, task):
+    """Send a prompt to OpenAI and return the response text."""
+    client = _get_openai_client()
+    model = get_model("openai")
 
+    print(f"[dim]Using OpenAI model: {model}[/dim]")
 
-def analyze_with_gemini(report_data, findings):
-    """Analyze security report using Google Gemini models."""
-    try:
-        import google.generativeai as genai
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": task["system"]},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=TEMPERATURE,
+        max_tokens=task["max_tokens"],
+        timeout=router.timeout("openai", REQUEST_TIMEOUT),
+    )
+    return response.choices[0].message.content
 
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            return (
-                None,
-                "Google API key not found. Set GOOGLE_API_KEY environment variable.",
-            )
 
-        genai.configure(api_key=api_key)
-        model_name = os.getenv("GOOGLE_MODEL", "gemini-flash-latest")
-        model = genai.GenerativeModel(model_name)
+def _call_anthropic(prompt, task):
+    """Send a prompt to Anthropic and return the response text."""
+    client = _get_anthropic_client()
+    model = get_model("anthropic")
 
-        prompt = create_analysis_prompt(report_data, findings)
+    print(f"[dim]Using Anthropic model: {model}[/dim]")
 
-        print(f"[dim]Using Google model: {model_name}[/dim]")
+    message = client.messages.create(
+        model=model,
+        max_tokens=task["max_tokens"],
+        temperature=TEMPERATURE,
+        system=task["system"],
+        messages=[{"role": "user", "content": prompt}],
+        timeout=router.timeout("anthropic", REQUEST_TIMEOUT),
+    )
+    return message.content[0].text
 
-        response = model.generate_content(
-            f"You are a cybersecurity expert. Analyze this security report:\n\n{prompt}"
-        )
 
-        return response.text, None
+def _call_gemini(prompt, task):
+    """Send a prompt to Google Gemini and return the response text."""
+    import google.generativeai as genai
+    from google.api_core.exceptions import DeadlineExceeded
 
-    except ImportError:
-        return (
-            None,
-            "Google Generative AI library not installed. Run: pip install google-generativeai",
-        )
-    except Exception as e:
-        return None, f"Gemini API error: {str(e)}"
+    genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+    model_name = get_model("gemini")
+    model = genai.GenerativeModel(model_name)
 
+    print(f"[dim]Using Google model: {model_name}[/dim]")
 
-def analyze_with_ollama(report_data, findings):
-    """Analyze security report using Ollama (local LLM)."""
-    try:
-        import requests
+    response = _retry_on_timeout(
+        lambda: model.generate_content(
+            f"{task['preamble']}\n\n{prompt}",
+            generation_config={"temperature": TEMPERATURE},
+            request_options={"timeout": router.timeout("gemini", REQUEST_TIMEOUT)},
+        ),
+        DeadlineExceeded,
+    )
+    return response.text
 
-        model = os.getenv("OLLAMA_MODEL", "llama3.2")
 
-        prompt = create_analysis_prompt(report_data, findings)
+def _call_ollama(prompt, task):
+    """Send a prompt to the local Ollama server and return the response text."""
+    import requests
 
-        print(f"[dim]Using Ollama model: {model}[/dim]")
+    model = get_model("ollama")
 
-        response = requests.post(
-            "http://localhost:11434/api/generate",
+    print(f"[dim]Using Ollama model: {model}[/dim]")
+
+    def generate():
+        # Stream the answer so the read timeout applies between chunks rather
+        # than to the whole generation
+        with _get_http_session().post(
+            f"{OLLAMA_URL}/api/generate",
             json={
                 "model": model,
-                "prompt": f"You are a cybersecurity expert. Analyze this security report:\n\n{prompt}",
-                "stream": False,
+                "prompt": f"{task['preamble']}\n\n{prompt}",
+                "stream": True,
+                "options": {"temperature": TEMPERATURE},
             },
-            timeout=120,
-        )
+            stream=True,
+            timeout=(
+                REQUEST_TIMEOUT,
+                router.timeout("ollama", OLLAMA_GENERATE_TIMEOUT),
+            ),
+        ) as response:
+            if response.status_code != 200:
+                raise RuntimeError(response.text)
+
+            chunks = []
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(chunk["error"])
+                chunks.append(chunk.get("response", ""))
+                if chunk.get("done"):
+                    break
+            return "".join(chunks)
+
+    return _retry_on_timeout(generate, requests.exceptions.Timeout)
+
+
+# Provider name -> (caller, library install hint, display name)
+PROVIDERS = {
+    "openai": (_call_openai, "pip install openai", "OpenAI"),
+    "anthropic": (_call_anthropic, "pip install anthropic", "Anthropic"),
+    "gemini": (_call_gemini, "pip install google-generativeai", "Gemini"),
+    "ollama": (_call_ollama, "pip install requests", "Ollama"),
+}
+
+
+def call_provider(provider, prompt, task, cache=None):
+    """
+    Send a prompt to one AI provider.
 
-        if response.status_code == 200:
-            return response.json()["response"], None
-        else:
-            return None, f"Ollama error: {response.text}"
+    Args:
+        provider: Provider name ('openai', 'anthropic', 'gemini' or 'ollama')
+        prompt: Prompt text
+        task: LOG_ANALYSIS_TASK or PCAP_ANALYSIS_TASK
+        cache: Optional LLMCache to answer repeated prompts from
 
+    Returns:
+        Tuple of (response: str or None, error: str or None)
+    """
+    caller, install_hint, name = PROVIDERS[provider]
+
+    if cache:
+        key = _cache_key(provider, prompt, task)
+        cached = cache.get(key)
+        if cached:
+            print(f"[dim]Using cached {name} response[/dim]")
+            return cached, None
+
+    started = time.monotonic()
+    try:
+        ai_response = caller(prompt, task)
+        if ai_response:
+            router.record_success(provider, time.monotonic() - started)
+        else:
+            router.record_failure(provider)
+        if cache and ai_response:
+            cache.set(key, ai_response)
+        return ai_response, None
+    except ImportError:
+        router.record_failure(provider)
+        return None, f"{name} library not installed. Run: {install_hint}"
     except Exception as e:
+        router.record_failure(provider)
+        if provider == "ollama":
+            return (
+                None,
+                f"Ollama error: {str(e)}. Make sure Ollama is running (ollama serve)",
+            )
+        return None, f"{name} API error: {str(e)}"
+
+
+def hedged_call(providers, prompt, task, stagger=HEDGE_STAGGER, cache=None):
+    """
+    Query providers in order and return the first successful response.
+
+    The first provider starts immediately. A failure starts the next one
+    right away; so does a provider that has not answered within `stagger`
+    seconds (by default its router timeout: 1.5x its recent p90 latency, or
+    the full request timeout while it has no history).
+
+    Calls that lose the race are not cancelled: they run to completion in
+    daemon threads, so they are still billed and may print and update the
+    router and response cache, but they never delay the caller or exit.
+
+    Returns:
+        Tuple of (provider: str or None, response: str or None, error: str or None)
+    """
+    results = queue.Queue()
+
+    def run(provider):
+        results.put((provider, call_provider(provider, prompt, task, cache)))
+
+    # Providers that failed recently go to the back of the queue
+    remaining = router.order(providers)
+    running = 0
+    errors = []
+
+    while remaining or running:
+        if remaining:
+            provider = remaining.pop(0)
+            threading.Thread(target=run, args=(provider,), daemon=True).start()
+            running += 1
+            wait = stagger
+            if wait is None:
+                ceil = (
+                    OLLAMA_GENERATE_TIMEOUT if provider == "ollama" else REQUEST_TIMEOUT
+                )
+                wait = router.timeout(provider, ceil)
+
+        try:
+            provider, (ai_response, error) = results.get(
+                timeout=wait if remaining else None
+            )
+        except queue.Empty:
+            continue  # too slow: start the next provider alongside it
+        running -= 1
+        if ai_response:
+            return provider, ai_response, None
+        errors.append(error or f"{provider.upper()} returned no response")
+
+    return None, None, "; ".join(errors)
+
+
+def analyze_with_openai(report_data, findings):
+    """Analyze security report using OpenAI GPT models."""
+    if not os.getenv("OPENAI_API_KEY"):
         return (
             None,
-            f"Ollama error: {str(e)}. Make sure Ollama is running (ollama serve)",
+            "OpenAI API key not found. Set OPENAI_API_KEY environment variable.",
         )
+    prompt = create_analysis_prompt(report_data, findings)
+    return call_provider("openai", prompt, LOG_ANALYSIS_TASK)
 
 
-def create_analysis_prompt(report_data, findings):
-    """Create a comprehensive prompt for AI analysis."""
+def analyze_with_anthropic(report_data, findings):
+    """Analyze security report using Anthropic Claude models."""
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        return (
+            None,
+            "Anthropic API key not found. Set ANTHROPIC_API_KEY environment variable.",
+        )
+    prompt = create_analysis_prompt(report_data, findings)
+    return call_provider("anthropic", prompt, LOG_ANALYSIS_TASK)
 
-    # Extract key information from report
-    total_events = (
-        len(report_data)
-        if isinstance(report_data, list)
-        else report_data.get("total_events", 0)
-    )
 
-    # Prepare event details
-    event_summary = {}
-    if hasattr(report_data, "to_dict"):
-        df = report_data
-        event_summary = {
-            "total_events": len(df),
-            "unique_event_ids": (
-                df["EventID"].nunique() if "EventID" in df.columns else 0
-            ),
-            "computers": (
-                df["Computer"].unique().tolist() if "Computer" in df.columns else []
-            ),
-            "sources": (
-                df["SourceName"].value_counts().to_dict()
-                if "SourceName" in df.columns
-                else {}
-            ),
-        }
+def analyze_with_gemini(report_data, findings):
+    """Analyze security report using Google Gemini models."""
+    if not os.getenv("GOOGLE_API_KEY"):
+        return (
+            None,
+            "Google API key not found. Set GOOGLE_API_KEY environment variable.",
+        )
+    prompt = create_analysis_prompt(report_data, findings)
+    return call_provider("gemini", prompt, LOG_ANALYSIS_TASK)
+
+
+def analyze_with_ollama(report_data, findings):
+    """Analyze security report using Ollama (local LLM)."""
+    prompt = create_analysis_prompt(report_data, findings)
+    return call_provider("ollama", prompt, LOG_ANALYSIS_TASK)
 
-    prompt = f"""# Security Event Log Analysis Report
+
+# Filled in by create_analysis_prompt
+ANALYSIS_PROMPT_TEMPLATE = """# Security Event Log Analysis Report
 
 ## Report Overview
-- **Analysis Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+- **Analysis Date**: {analysis_date}
 - **Total Events Analyzed**: {total_events}
-- **Systems Affected**: {', '.join(event_summary.get('computers', ['Unknown']))}
+- **Systems Affected**: {computers}
 
 ## Security Findings
-{chr(10).join(['- ' + finding for finding in findings])}
+{findings}
 
 ## Event Statistics
-- Unique Event IDs: {event_summary.get('unique_event_ids', 'N/A')}
-- Top Event Sources: {json.dumps(event_summary.get('sources', {}), indent=2)}
+- Unique Event IDs: {unique_event_ids}
+- Top Event Sources: {sources}
 
 ---
 
@@ -260,7 +526,46 @@ def create_analysis_prompt(report_data, findings):
 
 Please format your response in clear sections with markdown formatting."""
 
-    return prompt
+
+def create_analysis_prompt(report_data, findings):
+    """Create a comprehensive prompt for AI analysis."""
+
+    # Extract key information from report
+    total_events = (
+        len(report_data)
+        if isinstance(report_data, list)
+        else report_data.get("total_events", 0)
+    )
+
+    # Prepare event details
+    event_summary = {}
+    if hasattr(report_data, "to_dict"):
+        df = report_data
+        event_summary = {
+            "total_events": len(df),
+            "unique_event_ids": (
+                df["EventID"].nunique() if "EventID" in df.columns else 0
+            ),
+            "computers": (
+                df["Computer"].unique().tolist() if "Computer" in df.columns else []
+            ),
+            "sources": (
+                df["SourceName"].value_counts().to_dict()
+                if "SourceName" in df.columns
+                else {}
+            ),
+        }
+
+    return ANALYSIS_PROMPT_TEMPLATE.format_map(
+        {
+            "analysis_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_events": event_summary.get("total_events", total_events),
+            "computers": ", ".join(event_summary.get("computers", ["Unknown"])),
+            "findings": "\n".join("- " + finding for finding in findings),
+            "unique_event_ids": event_summary.get("unique_event_ids", "N/A"),
+            "sources": json.dumps(event_summary.get("sources", {}), indent=2),
+        }
+    )
 
 
 def analyze_report_with_ai(report_df, findings, report_dir, report_number=None):
@@ -278,10 +583,10 @@ def analyze_report_with_ai(report_df, findings, report_dir, report_number=None):
     """
     print("\n[bold cyan]═══ AI-Powered Security Analysis ═══[/bold cyan]\n")
 
-    # Detect available AI provider
-    provider = get_ai_provider()
+    # Detect available AI providers
+    providers = get_ai_providers()
 
-    if not provider:
+    if not providers:
         error_msg = """[yellow]⚠️ No AI provider configured.[/yellow]
 
 To use AI analysis, configure one of the following:
@@ -309,21 +614,19 @@ To use AI analysis, configure one of the following:
         print(error_msg)
         return False, None, "No AI provider configured"
 
-    print(f"[green]✓ Detected AI provider: {provider.upper()}[/green]")
+    print(
+        f"[green]✓ Detected AI provider: {', '.join(p.upper() for p in providers)}[/green]"
+    )
     print("[dim]Analyzing security events...[/dim]\n")
 
-    # Call the appropriate AI provider
-    ai_response = None
-    error = None
-
-    if provider == "openai":
-        ai_response, error = analyze_with_openai(report_df, findings)
-    elif provider == "anthropic":
-        ai_response, error = analyze_with_anthropic(report_df, findings)
-    elif provider == "gemini":
-        ai_response, error = analyze_with_gemini(report_df, findings)
-    elif provider == "ollama":
-        ai_response, error = analyze_with_ollama(report_df, findings)
+    # Ask the providers in order, falling back if one is slow or fails
+    prompt = create_analysis_prompt(report_df, findings)
+    provider, ai_response, error = hedged_call(
+        providers,
+        prompt,
+        LOG_ANALYSIS_TASK,
+        cache=get_response_cache(report_dir),
+    )
 
     if error:
         print(f"[bold red]✗ Error: {error}[/bold red]")
@@ -336,40 +639,239 @@ To use AI analysis, configure one of the following:
 
     # Display the AI analysis
     print("\n[bold green]✓ Analysis Complete![/bold green]\n")
-    console.print(
-        Panel(
-            Markdown(ai_response),
-            title="[bold]AI Security Analysis & Remediation Guide[/bold]",
-            border_style="green",
-        )
-    )
+    show_analysis(ai_response, "AI Security Analysis & Remediation Guide")
 
     # Save the AI report in log_analysis subdirectory with matching number
-    subdir = os.path.join(report_dir, "log_analysis")
+    try:
+        ai_report_file = save_ai_report(
+            ai_response, provider, report_dir, "log_analysis", report_number
+        )
+
+        print(f"\n[green]✓ AI analysis saved to:[/green] {ai_report_file}")
+        return True, ai_response, None
+
+    except Exception as e:
+        error = f"Failed to save AI report: {str(e)}"
+        print(f"[yellow]⚠️ {error}[/yellow]")
+        return True, ai_response, error
+
+
+def save_ai_report(
+    ai_response,
+    provider,
+    report_dir,
+    category,
+    report_number=None,
+    title="AI Security Analysis Report",
+):
+    """
+    Save an AI analysis as markdown next to the report it belongs to.
+
+    Args:
+        ai_response: Markdown text returned by the provider
+        provider: Provider that produced the analysis
+        report_dir: Base report directory
+        category: 'log_analysis' or 'pcap_analysis'
+        report_number: Number of the matching report (timestamp used if None)
+        title: Heading written at the top of the file
+
+    Returns:
+        str: Path of the saved file
+    """
+    subdir = os.path.join(report_dir, category)
     os.makedirs(subdir, exist_ok=True)
+    now = datetime.now()
 
     if report_number:
         ai_report_file = os.path.join(subdir, f"ai_report_{report_number}.md")
     else:
         # Fallback to timestamp if no report number
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         ai_report_file = os.path.join(subdir, f"ai_report_{timestamp}.md")
 
+    with open(ai_report_file, "w", encoding="utf-8") as f:
+        f.write(_format_ai_report(title, provider, ai_response, now))
+
+    return ai_report_file
+
+
+def _format_ai_report(title, provider, ai_response, generated):
+    """Build the full markdown file contents so it is written in one call."""
+    return (
+        f"# {title}\n\n"
+        f"**Generated**: {generated.strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"**AI Provider**: {provider.upper()}\n\n"
+        "---\n\n"
+        f"{ai_response}"
+    )
+
+
+def show_analysis(ai_response, title):
+    """Render an AI analysis in a panel when writing to an interactive terminal."""
+    if QUIET or not console.is_terminal:
+        return
+    console.print(
+        Panel(
+            Markdown(ai_response),
+            title=f"[bold]{title}[/bold]",
+            border_style="green",
+        )
+    )
+
+
+async def aanalyze_report_with_ai(report_df, findings, report_dir, report_number=None):
+    """
+    Async variant of analyze_report_with_ai.
+
+    The blocking provider call runs in the default executor so several
+    analyses can wait on the network at the same time.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, analyze_report_with_ai, report_df, findings, report_dir, report_number
+    )
+
+
+def analyze_reports_with_ai(jobs, report_dir):
+    """
+    Analyze several reports concurrently.
+
+    Args:
+        jobs: Iterable of (report_df, findings, report_number) tuples
+        report_dir: Directory to save the AI analysis reports
+
+    Returns:
+        List of (success, ai_report, error) tuples in the same order as jobs
+    """
+
+    async def run_all():
+        return await asyncio.gather(
+            *(
+                aanalyze_report_with_ai(df, findings, report_dir, report_number)
+                for df, findings, report_number in jobs
+            )
+        )
+
+    return asyncio.run(run_all())
+
+
+def analyze_reports_batch(jobs, report_dir, poll_interval=BATCH_POLL_INTERVAL):
+    """
+    Analyze several reports through the OpenAI Batch API.
+
+    Batch requests cost about half as much as live ones and do not count
+    against rate limits, but results can take up to 24 hours, so this is
+    meant for offline runs. Falls back to analyze_reports_with_ai when no
+    OpenAI key is configured.
+
+    Args:
+        jobs: Iterable of (report_df, findings, report_number) tuples
+        report_dir: Directory to save the AI analysis reports
+        poll_interval: Seconds between batch status checks
+
+    Returns:
+        List of (success, ai_report, error) tuples in the same order as jobs
+    """
+    jobs = list(jobs)
+    if not os.getenv("OPENAI_API_KEY"):
+        return analyze_reports_with_ai(jobs, report_dir)
+
     try:
-        with open(ai_report_file, "w", encoding="utf-8") as f:
-            f.write(f"# AI Security Analysis Report\n\n")
-            f.write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"**AI Provider**: {provider.upper()}\n\n")
-            f.write("---\n\n")
-            f.write(ai_response)
+        client = _get_openai_client()
+    except ImportError:
+        return analyze_reports_with_ai(jobs, report_dir)
+
+    model = get_model("openai")
+    task = LOG_ANALYSIS_TASK
+    cache = get_response_cache(report_dir)
+    prompts = [create_analysis_prompt(df, findings) for df, findings, _ in jobs]
+    # Timestamp-free keys, so reruns of the same reports are answered from cache
+    keys = [_cache_key("openai", prompt, task) for prompt in prompts]
+    responses = {}
+    errors = {}
+
+    # Answer what we can from the cache and batch the rest
+    requests_jsonl = []
+    for i, prompt in enumerate(prompts):
+        if cache:
+            cached = cache.get(keys[i])
+            if cached:
+                responses[i] = cached
+                continue
+        requests_jsonl.append(
+            json.dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "messages": [
+                            {"role": "system", "content": task["system"]},
+                            {"role": "user", "content": prompt},
+                        ],
+                        "temperature": TEMPERATURE,
+                        "max_tokens": task["max_tokens"],
+                    },
+                }
+            )
+        )
 
-        print(f"\n[green]✓ AI analysis saved to:[/green] {ai_report_file}")
-        return True, ai_response, None
+    if requests_jsonl:
+        try:
+            batch_file = client.files.create(
+                file=("batch.jsonl", "\n".join(requests_jsonl).encode("utf-8")),
+                purpose="batch",
+            )
+            batch = client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            print(
+                f"[cyan]Submitted {len(requests_jsonl)} report(s) as OpenAI batch {batch.id}[/cyan]"
+            )
 
-    except Exception as e:
-        error = f"Failed to save AI report: {str(e)}"
-        print(f"[yellow]⚠️ {error}[/yellow]")
-        return True, ai_response, error
+            while batch.status in ("validating", "in_progress", "finalizing"):
+                time.sleep(poll_interval)
+                batch = client.batches.retrieve(batch.id)
+
+            # Successful requests land in the output file, failed ones in the
+            # error file; both use the same line format
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                for line in client.files.content(file_id).text.splitlines():
+                    if not line.strip():
+                        continue
+                    result = json.loads(line)
+                    i = int(result["custom_id"])
+                    body = (result.get("response") or {}).get("body") or {}
+                    if body.get("choices"):
+                        responses[i] = body["choices"][0]["message"]["content"]
+                        if cache:
+                            cache.set(keys[i], responses[i])
+                    else:
+                        errors[i] = str(result.get("error") or body.get("error"))
+        except Exception as e:
+            return [(False, None, f"OpenAI batch error: {str(e)}") for _ in jobs]
+
+    results = []
+    for i, (_, _, report_number) in enumerate(jobs):
+        if i not in responses:
+            error = errors.get(i, f"Batch ended with status: {batch.status}")
+            results.append((False, None, error))
+            continue
+        try:
+            ai_report_file = save_ai_report(
+                responses[i], "openai", report_dir, "log_analysis", report_number
+            )
+            print(f"[green]✓ AI analysis saved to:[/green] {ai_report_file}")
+            results.append((True, responses[i], None))
+        except Exception as e:
+            results.append((True, responses[i], f"Failed to save AI report: {str(e)}"))
+
+    return results
 
 
 def quick_ai_analysis(findings_text):
@@ -391,10 +893,7 @@ Be concise (under 300 words)."""
 
     if provider == "openai":
         try:
-            import openai
-
-            openai.api_key = os.getenv("OPENAI_API_KEY")
-            response = openai.chat.completions.create(
+            response = _get_openai_client().chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": simple_prompt}],
                 max_tokens=500,
@@ -407,10 +906,8 @@ Be concise (under 300 words)."""
     return None, f"Quick analysis not implemented for {provider}"
 
 
-def create_pcap_analysis_prompt(report_content):
-    """Create a comprehensive prompt for PCAP analysis."""
-
-    prompt = f"""# Network Traffic Analysis Report
+# Filled in by create_pcap_analysis_prompt
+PCAP_PROMPT_TEMPLATE = """# Network Traffic Analysis Report
 
 ## PCAP Capture Analysis
 
@@ -462,26 +959,31 @@ Below is an automatic analysis of a network packet capture (PCAP) file:
 
 Please format your response in clear sections with markdown formatting. Be specific and actionable."""
 
-    return prompt
 
+def create_pcap_analysis_prompt(report_content):
+    """Create a comprehensive prompt for PCAP analysis."""
+
+    return PCAP_PROMPT_TEMPLATE.format_map({"report_content": report_content})
 
-def analyze_pcap_with_ai(report_content, report_dir):
+
+def analyze_pcap_with_ai(report_content, report_dir, report_number=None):
     """
     Analyze PCAP report with AI to provide security insights.
 
     Args:
         report_content: String content of the PCAP analysis report
         report_dir: Directory to save the AI analysis report
+        report_number: Optional report number to match with the PCAP report
 
     Returns:
         Tuple of (success: bool, ai_report: str or None, error: str or None)
     """
     print("\n[bold cyan]═══ AI-Powered Network Security Analysis ═══[/bold cyan]\n")
 
-    # Detect available AI provider
-    provider = get_ai_provider()
+    # Detect available AI providers
+    providers = get_ai_providers()
 
-    if not provider:
+    if not providers:
         error_msg = """[yellow]⚠️ No AI provider configured.[/yellow]
 
 To use AI analysis, configure one of the following:
@@ -505,88 +1007,21 @@ To use AI analysis, configure one of the following:
         print(error_msg)
         return False, None, "No AI provider configured"
 
-    print(f"[green]✓ Detected AI provider: {provider.upper()}[/green]")
+    print(
+        f"[green]✓ Detected AI provider: {', '.join(p.upper() for p in providers)}[/green]"
+    )
     print("[dim]Analyzing network traffic patterns...[/dim]\n")
 
     # Create specialized PCAP analysis prompt
     prompt = create_pcap_analysis_prompt(report_content)
 
-    # Call the appropriate AI provider
-    ai_response = None
-    error = None
-
-    try:
-        if provider == "gemini":
-            import google.generativeai as genai
-
-            api_key = os.getenv("GOOGLE_API_KEY")
-            genai.configure(api_key=api_key)
-            model_name = os.getenv("GOOGLE_MODEL", "gemini-flash-latest")
-            model = genai.GenerativeModel(model_name)
-            print(f"[dim]Using Google model: {model_name}[/dim]")
-            response = model.generate_content(
-                f"You are a network security and cybersecurity expert. Analyze this PCAP report:\n\n{prompt}"
-            )
-            ai_response = response.text
-
-        elif provider == "openai":
-            import openai
-
-            api_key = os.getenv("OPENAI_API_KEY")
-            openai.api_key = api_key
-            model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-            print(f"[dim]Using OpenAI model: {model}[/dim]")
-            response = openai.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a network security and cybersecurity expert specializing in traffic analysis, threat detection, and incident response. Provide detailed, actionable analysis.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=2500,
-            )
-            ai_response = response.choices[0].message.content
-
-        elif provider == "anthropic":
-            import anthropic
-
-            api_key = os.getenv("ANTHROPIC_API_KEY")
-            client = anthropic.Anthropic(api_key=api_key)
-            model = os.getenv("ANTHROPIC_MODEL", "claude-3-5-sonnet-20241022")
-            print(f"[dim]Using Anthropic model: {model}[/dim]")
-            message = client.messages.create(
-                model=model,
-                max_tokens=2500,
-                temperature=0.7,
-                system="You are a network security and cybersecurity expert specializing in traffic analysis, threat detection, and incident response.",
-                messages=[{"role": "user", "content": prompt}],
-            )
-            ai_response = message.content[0].text
-
-        elif provider == "ollama":
-            import requests
-
-            model = os.getenv("OLLAMA_MODEL", "llama3.2")
-            print(f"[dim]Using Ollama model: {model}[/dim]")
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": model,
-                    "prompt": f"You are a network security expert. Analyze this PCAP report:\n\n{prompt}",
-                    "stream": False,
-                },
-                timeout=180,
-            )
-            if response.status_code == 200:
-                ai_response = response.json()["response"]
-            else:
-                error = f"Ollama error: {response.text}"
-
-    except Exception as e:
-        error = f"{provider.upper()} API error: {str(e)}"
+    # Ask the providers in order, falling back if one is slow or fails
+    provider, ai_response, error = hedged_call(
+        providers,
+        prompt,
+        PCAP_ANALYSIS_TASK,
+        cache=get_response_cache(report_dir),
+    )
 
     if error:
         print(f"[bold red]✗ Error: {error}[/bold red]")
@@ -599,32 +1034,18 @@ To use AI analysis, configure one of the following:
 
     # Display the AI analysis
     print("\n[bold green]✓ Network Security Analysis Complete![/bold green]\n")
-    console.print(
-        Panel(
-            Markdown(ai_response),
-            title="[bold]AI Network Security Analysis & Recommendations[/bold]",
-            border_style="green",
-        )
-    )
+    show_analysis(ai_response, "AI Network Security Analysis & Recommendations")
 
     # Save the AI report in pcap_analysis subdirectory with matching number
-    subdir = os.path.join(report_dir, "pcap_analysis")
-    os.makedirs(subdir, exist_ok=True)
-
-    if report_number:
-        ai_report_file = os.path.join(subdir, f"ai_report_{report_number}.md")
-    else:
-        # Fallback to timestamp if no report number
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        ai_report_file = os.path.join(subdir, f"ai_report_{timestamp}.md")
-
     try:
-        with open(ai_report_file, "w", encoding="utf-8") as f:
-            f.write(f"# AI Network Security Analysis Report\n\n")
-            f.write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"**AI Provider**: {provider.upper()}\n\n")
-            f.write("---\n\n")
-            f.write(ai_response)
+        ai_report_file = save_ai_report(
+            ai_response,
+            provider,
+            report_dir,
+            "pcap_analysis",
+            report_number,
+            title="AI Network Security Analysis Report",
+        )
 
         print(f"\n[green]✓ AI analysis saved to:[/green] {ai_report_file}")
         return True, ai_response, None
@@ -0,0 +1,49 @@
+"""
+AI response cache - reuse answers for prompts that were already analyzed
+"""
+
+import os
+import json
+import time
+import hashlib
+
+
+class LLMCache:
+    """Disk cache of AI responses keyed by provider, model and prompt."""
+
+    def __init__(self, cache_dir, ttl=86400):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(provider, model, prompt):
+        """Build a stable cache key for one request."""
+        payload = json.dumps(
+            {"provider": provider, "model": model, "prompt": prompt}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.md")
+
+    def get(self, key):
+        """Return the cached response, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            if os.path.getmtime(path) < time.time() - self.ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key, response):
+        """Store a response. Failures are ignored since the cache is optional."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(key)}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(response)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            pass
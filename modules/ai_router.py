@@ -0,0 +1,121 @@
+"""
+AI provider routing - keep using providers that work, back off from failing ones
+"""
+
+import time
+import statistics
+import threading
+from collections import deque
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider."""
+
+    def __init__(self, n=50):
+        self._samples = deque(maxlen=n)
+
+    def record(self, latency):
+        """Add the duration of a successful call in seconds."""
+        self._samples.append(latency)
+
+    def mean(self):
+        """Average recent latency, or None before the first sample."""
+        if not self._samples:
+            return None
+        return sum(self._samples) / len(self._samples)
+
+    def timeout(self, floor=5.0, ceil=60.0, mult=1.5):
+        """
+        Suggest a timeout of `mult` times the recent 90th percentile latency.
+
+        Returns `ceil` until at least 10 samples have been collected, and
+        never less than `floor`.
+        """
+        if len(self._samples) < 10:
+            return ceil
+        p90 = statistics.quantiles(self._samples, n=10)[8]
+        return max(floor, min(ceil, p90 * mult))
+
+
+class ProviderRouter:
+    """
+    Track provider health so a failing provider stops being tried first.
+
+    After a failure a provider is moved behind the healthy ones for
+    `recheck_interval` seconds (longer after repeated failures). The next
+    real request once that time has passed doubles as its health check, so
+    no extra probe traffic is sent to paid APIs.
+    """
+
+    def __init__(self, recheck_interval=30, max_backoff=300):
+        self.recheck_interval = recheck_interval
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._current = None
+        self._failure_count = {}
+        self._retry_at = {}
+        self._latency = {}
+
+    def order(self, providers):
+        """Return providers with healthy ones first, otherwise in the given order."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [p for p in providers if self._retry_at.get(p, 0) <= now]
+            backing_off = [p for p in providers if self._retry_at.get(p, 0) > now]
+        return healthy + backing_off
+
+    def pick(self, providers):
+        """Return the provider to try first, or None if there are none."""
+        ordered = self.order(providers)
+        return ordered[0] if ordered else None
+
+    def record_success(self, provider, latency):
+        """Mark a provider healthy and remember how long it took."""
+        with self._lock:
+            self._current = provider
+            self._failure_count[provider] = 0
+            self._retry_at.pop(provider, None)
+            self._latency.setdefault(provider, LatencyTracker()).record(latency)
+
+    def timeout(self, provider, ceil):
+        """Adaptive timeout for a provider, capped at the configured `ceil`."""
+        with self._lock:
+            tracker = self._latency.get(provider)
+            if tracker is None:
+                return ceil
+            return tracker.timeout(ceil=ceil)
+
+    def record_failure(self, provider):
+        """Mark a provider as failing and back off from it."""
+        with self._lock:
+            failures = self._failure_count.get(provider, 0) + 1
+            self._failure_count[provider] = failures
+            backoff = min(self.recheck_interval * failures, self.max_backoff)
+            self._retry_at[provider] = time.monotonic() + backoff
+            if self._current == provider:
+                self._current = None
+
+    def status(self):
+        """
+        Summarize provider health for debug output.
+
+        Returns:
+            dict: 'current' provider plus per-provider failures, seconds until
+            retry and average recent latency
+        """
+        now = time.monotonic()
+        with self._lock:
+            providers = set(self._failure_count) | set(self._latency)
+            return {
+                "current": self._current,
+                "providers": {
+                    p: {
+                        "failures": self._failure_count.get(p, 0),
+                        "retry_in": max(0.0, self._retry_at.get(p, 0) - now),
+                        "avg_latency": (
+                            self._latency[p].mean() if p in self._latency else None
+                        ),
+                    }
+                    for p in sorted(providers)
+                },
+            }
@@ -1,206 +1,565 @@
-from Evtx.Evtx import Evtx
-from Evtx.Views import evtx_file_xml_view
+import os
+import glob
+import gzip
+import json
+from functools import partial
+from multiprocessing import Pool
+from Evtx.Evtx import Evtx, ChunkHeader
+from Evtx.Views import evtx_file_xml_view, evtx_chunk_xml_view
 import pandas as pd
-import xml.etree.ElementTree as ET
 from rich import print
 from datetime import datetime
+from modules.utils import compact_log_frame
+
+# Optional libxml2-backed XML parser (pip install lxml), much faster than the
+# standard library ElementTree it replaces
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+# Optional Rust-backed EVTX reader (pip install evtx), much faster than python-evtx
+try:
+    from evtx import PyEvtxParser
+except ImportError:
+    PyEvtxParser = None  # fall back to python-evtx
+
+# Optional Arrow library (pip install pyarrow), used to cache parsed logs as
+# Parquet so reloading an unchanged file skips parsing
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None  # parse every time
+
+# Worker processes that parse python-evtx chunks in parallel (1 disables).
+# Smaller files are parsed serially, since starting the pool costs more than
+# it saves on them.
+EVTX_WORKERS = int(os.getenv("EVTX_WORKERS", str(os.cpu_count() or 1)))
+EVTX_PARALLEL_THRESHOLD = 32 * 1024 * 1024
+
+# Newline-delimited JSON logs at least this large are read in chunks of
+# JSON_CHUNK_ROWS records instead of as one document
+JSON_CHUNK_THRESHOLD = 64 * 1024 * 1024
+JSON_CHUNK_ROWS = 100_000
+
+# Longest first line read when telling newline-delimited JSON from a single
+# document; a longer one is cut off, fails to parse and counts as a document
+_JSON_LINE_LIMIT = 1024 * 1024
+
+# EVTX files are split into independent chunks of this many bytes
+_CHUNK_SIZE = 0x10000
+
+# Event schema namespace and the tags read from each record
+_NS_URI = "http://schemas.microsoft.com/win/2004/08/events/event"
+_NS = "{" + _NS_URI + "}"
+_TAG_SYSTEM = _NS + "System"
+_TAG_EVENTID = _NS + "EventID"
+_TAG_TIME = _NS + "TimeCreated"
+_TAG_PROVIDER = _NS + "Provider"
+_TAG_LEVEL = _NS + "Level"
+_TAG_COMPUTER = _NS + "Computer"
+_TAG_CHANNEL = _NS + "Channel"
+_TAG_EVENTDATA = _NS + "EventData"
+_TAG_USERDATA = _NS + "UserData"
+
+
+def _iter_xml_records(file_path):
+    """Yield the XML of each record in an EVTX file using the fastest backend."""
+    if PyEvtxParser is not None:
+        for record in PyEvtxParser(file_path).records():
+            yield record["data"]
+    else:
+        with Evtx(file_path) as log:
+            yield from evtx_file_xml_view(log)
+
+
+# Column order of the DataFrame built by parse_evtx_file
+EVTX_COLUMNS = [
+    "TimeGenerated",
+    "EventID",
+    "SourceName",
+    "EventType",
+    "EventCategory",
+    "Computer",
+    "Message",
+]
+
+
+def _record_xml(record):
+    """Return a record's XML from either EVTX backend as delivered (str or bytes)."""
+    if isinstance(record, tuple):
+        record = record[0]
+    return record if isinstance(record, (str, bytes)) else str(record)
+
+
+def _as_text(raw_xml):
+    """Decode record XML to str only where text is actually needed."""
+    if isinstance(raw_xml, bytes):
+        return raw_xml.decode("utf-8", errors="ignore")
+    return raw_xml
+
+
+def _text_between(text, start, end, pos=0):
+    """Return the text between the first start marker after pos and end, or None."""
+    begin = text.find(start, pos)
+    if begin == -1:
+        return None
+    begin += len(start)
+    stop = text.find(end, begin)
+    if stop == -1:
+        return None
+    return text[begin:stop]
+
+
+def _salvage_sys_fields(raw_xml):
+    """
+    Pull EventID, Computer and SystemTime out of XML that failed to parse.
+
+    The fields sit between fixed markers, so plain str.find scans locate them
+    without running the regex engine.
+
+    Returns:
+        tuple: (event_id, computer, time_generated), with None/"" when missing
+    """
+    event_id = None
+    tag = raw_xml.find("<EventID")
+    if tag != -1:
+        value = _text_between(raw_xml, ">", "</EventID>", tag)
+        if value and value.isdigit():
+            event_id = int(value)
+
+    computer = _text_between(raw_xml, "<Computer>", "</Computer>")
+    if not computer or "<" in computer:
+        computer = ""
+
+    time_gen = _text_between(raw_xml, 'SystemTime="', '"') or None
+
+    return event_id, computer, time_gen
+
+
+# lxml (rather than the standard library fallback) is in use
+_LXML = hasattr(ET, "XPath")
+
+if _LXML:
+    # lxml: compile the System field lookups once instead of per record
+    _XPATH_NS = {"e": _NS_URI}
+    _XP_EVENTID = ET.XPath("e:EventID/text()", namespaces=_XPATH_NS)
+    _XP_TIME = ET.XPath("e:TimeCreated/@SystemTime", namespaces=_XPATH_NS)
+    _XP_PROVIDER = ET.XPath("e:Provider/@Name", namespaces=_XPATH_NS)
+    _XP_LEVEL = ET.XPath("e:Level/text()", namespaces=_XPATH_NS)
+    _XP_COMPUTER = ET.XPath("e:Computer/text()", namespaces=_XPATH_NS)
+    _XP_CHANNEL = ET.XPath("e:Channel/text()", namespaces=_XPATH_NS)
+
+    def _system_fields(system):
+        """Read the System fields of a record with the precompiled XPaths."""
+        event_id = _XP_EVENTID(system)
+        time_created = _XP_TIME(system)
+        provider = _XP_PROVIDER(system)
+        level = _XP_LEVEL(system)
+        computer = _XP_COMPUTER(system)
+        channel = _XP_CHANNEL(system)
+        return {
+            "EventID": int(event_id[0]) if event_id else None,
+            "TimeGenerated": str(time_created[0]) if time_created else None,
+            "SourceName": str(provider[0]) if provider else "",
+            "EventType": int(level[0]) if level else 0,
+            "Computer": str(computer[0]) if computer else "",
+            "EventCategory": str(channel[0]) if channel else "",
+        }
+
+else:
+
+    def _system_fields(system):
+        """Read the System fields of a record with ElementTree lookups."""
+        # Event ID
+        event_id = system.find(_TAG_EVENTID)
+
+        # Time Created
+        time_created = system.find(_TAG_TIME)
+
+        # Provider
+        provider = system.find(_TAG_PROVIDER)
+
+        # Level (severity)
+        level = system.find(_TAG_LEVEL)
+
+        # Computer
+        computer = system.find(_TAG_COMPUTER)
+
+        # Channel
+        channel = system.find(_TAG_CHANNEL)
+
+        return {
+            "EventID": int(event_id.text) if event_id is not None else None,
+            "TimeGenerated": (
+                time_created.get("SystemTime", "") if time_created is not None else None
+            ),
+            "SourceName": provider.get("Name", "") if provider is not None else "",
+            "EventType": int(level.text) if level is not None else 0,
+            "Computer": computer.text if computer is not None else "",
+            "EventCategory": channel.text if channel is not None else "",
+        }
+
+
+def _parse_record(raw_xml, keep_raw=True):
+    """
+    Turn one record's XML into an entry dict, salvaging what it can on errors.
+
+    Args:
+        raw_xml: Record XML as str or bytes; bytes are parsed without decoding
+        keep_raw: Include the XML text under RawXML
+    """
+    try:
+        # Parse XML to extract structured data (lxml rejects str input that
+        # carries an encoding declaration, so it only gets bytes)
+        if isinstance(raw_xml, str) and _LXML:
+            root = ET.fromstring(raw_xml.encode("utf-8"))
+        else:
+            root = ET.fromstring(raw_xml)
+
+        # Extract System information
+        system = root.find(_TAG_SYSTEM)
+
+        entry = {}
+        if keep_raw:
+            # Store as tuple format for JSON compatibility
+            entry["RawXML"] = [_as_text(raw_xml), {}]
+
+        if system is not None:
+            entry.update(_system_fields(system))
+
+        # Extract EventData (for EventData format)
+        event_data = root.find(_TAG_EVENTDATA)
+        if event_data is not None:
+            message_parts = [
+                f"{data.get('Name', '')}: {data.text}"
+                for data in event_data
+                if data.text
+            ]
+            if message_parts:
+                entry["Message"] = " | ".join(message_parts)
+                return entry
+
+        # Extract UserData (for UserData format events like 1102)
+        message_parts = []
+        user_data = root.find(_TAG_USERDATA)
+        if user_data is not None:
+            # Extract all child elements
+            for child in user_data.iter():
+                tag = child.tag
+                # lxml also yields comments, whose tag is not a str
+                if not isinstance(tag, str):
+                    continue
+                text = child.text.strip() if child.text else ""
+                if text:
+                    # Drop any "{namespace}" prefix (UserData payloads use
+                    # their own namespaces) in one C-level call
+                    message_parts.append(f"{tag.rpartition('}')[2]}: {text}")
+
+        entry["Message"] = (
+            " | ".join(message_parts) if message_parts else "No message data"
+        )
 
-
-def parse_evtx_file(file_path):
-    """Parse user-submitted Windows .evtx log file into a structured DataFrame."""
-    entries = []
-
+        return entry
+
+    except Exception as parse_error:
+        # If XML parsing fails, try to extract at least some basic info
+        raw_xml = _as_text(raw_xml)
+        event_id, computer, time_gen = _salvage_sys_fields(raw_xml)
+
+        entry = {"RawXML": [raw_xml, {}]} if keep_raw else {}
+        entry.update(
+            {
+                "EventID": event_id,
+                "TimeGenerated": time_gen,
+                "SourceName": "",
+                "EventType": 0,
+                "EventCategory": "",
+                "Computer": computer,
+                "Message": f"Partial parse - Error: {str(parse_error)}",
+            }
+        )
+        return entry
+
+
+def _iter_chunk_buffers(file_path):
+    """Yield a standalone copy of each chunk of an EVTX file."""
+    with Evtx(file_path) as log:
+        for chunk in log.chunks():
+            offset = chunk.offset()
+            yield bytes(chunk._buf[offset : offset + _CHUNK_SIZE])
+
+
+def _parse_chunk_bytes(buf, keep_raw=True):
+    """Parse every record of one EVTX chunk (runs in a worker process)."""
+    chunk = ChunkHeader(buf, 0)
+    return [
+        _parse_record(_record_xml(record), keep_raw)
+        for record in evtx_chunk_xml_view(chunk)
+    ]
+
+
+def _json_text(value):
+    """Return the text of a JSON-rendered element ("#text" when it has attributes)."""
+    if isinstance(value, dict):
+        value = value.get("#text")
+    if isinstance(value, list):
+        value = " ".join(str(v) for v in value)
+    return value
+
+
+def _json_leaves(node):
+    """Yield (name, text) for every element with text under a JSON-rendered node."""
+    for name, value in node.items():
+        if name == "#attributes":
+            continue
+        if isinstance(value, dict) and "#text" not in value:
+            yield from _json_leaves(value)
+        else:
+            text = _json_text(value)
+            if text is not None and str(text).strip():
+                yield name, str(text).strip()
+
+
+def _parse_json_record(data):
+    """
+    Turn one record rendered as JSON by the Rust reader into an entry dict.
+
+    The reader builds the JSON straight from the binary XML tokens, so no XML
+    text is produced or parsed. Fields mirror _parse_record.
+    """
+    try:
+        event = json.loads(data)["Event"]
+        system = event.get("System") or {}
+        entry = {}
+
+        if system:
+            event_id = _json_text(system.get("EventID"))
+            entry["EventID"] = int(event_id) if event_id is not None else None
+
+            time_created = system.get("TimeCreated")
+            entry["TimeGenerated"] = (
+                time_created.get("#attributes", {}).get("SystemTime", "")
+                if isinstance(time_created, dict)
+                else None
+            )
+
+            provider = system.get("Provider")
+            entry["SourceName"] = (
+                provider.get("#attributes", {}).get("Name", "")
+                if isinstance(provider, dict)
+                else ""
+            )
+
+            level = _json_text(system.get("Level"))
+            entry["EventType"] = int(level) if level is not None else 0
+
+            entry["Computer"] = _json_text(system.get("Computer")) or ""
+            entry["EventCategory"] = _json_text(system.get("Channel")) or ""
+
+        # EventData entries are keyed by their Name attribute ("Data" when
+        # unnamed, which the XML path renders with an empty name)
+        message_parts = []
+        event_data = event.get("EventData")
+        if isinstance(event_data, dict):
+            for name, value in event_data.items():
+                if name == "#attributes":
+                    continue
+                text = _json_text(value)
+                if text:
+                    message_parts.append(f"{'' if name == 'Data' else name}: {text}")
+
+        # UserData (for UserData format events like 1102)
+        if not message_parts:
+            user_data = event.get("UserData")
+            if isinstance(user_data, dict):
+                message_parts = [
+                    f"{name}: {text}" for name, text in _json_leaves(user_data)
+                ]
+
+        entry["Message"] = (
+            " | ".join(message_parts) if message_parts else "No message data"
+        )
+        return entry
+
+    except Exception as parse_error:
+        return {
+            "EventID": None,
+            "TimeGenerated": None,
+            "SourceName": "",
+            "EventType": 0,
+            "EventCategory": "",
+            "Computer": "",
+            "Message": f"Partial parse - Error: {str(parse_error)}",
+        }
+
+
+def parse_evtx_file_iter(file_path, keep_raw=True):
+    """
+    Parse a Windows .evtx log file one record at a time.
+
+    With the Rust reader and keep_raw=False, records are read as JSON built
+    straight from the binary XML, skipping XML text entirely. Without the
+    Rust reader, chunks of files of at least EVTX_PARALLEL_THRESHOLD bytes are
+    spread over EVTX_WORKERS processes since each one decodes independently;
+    records still come back in file order.
+
+    Args:
+        file_path: Path to the .evtx file
+        keep_raw: Include each record's XML under RawXML
+
+    Yields:
+        dict: One entry per record, with the keys listed in EVTX_COLUMNS
+        (plus RawXML when keep_raw is set)
+    """
+    if PyEvtxParser is not None and not keep_raw:
+        for record in PyEvtxParser(file_path).records_json():
+            yield _parse_json_record(record["data"])
+        return
+
+    if (
+        PyEvtxParser is None
+        and EVTX_WORKERS > 1
+        and os.path.getsize(file_path) >= EVTX_PARALLEL_THRESHOLD
+    ):
+        with Pool(EVTX_WORKERS) as pool:
+            for entries in pool.imap(
+                partial(_parse_chunk_bytes, keep_raw=keep_raw),
+                _iter_chunk_buffers(file_path),
+                chunksize=4,
+            ):
+                yield from entries
+        return
+
+    for record in _iter_xml_records(file_path):
+        yield _parse_record(_record_xml(record), keep_raw)
+
+
+def _build_evtx_frame(columns):
+    """Build the EVTX DataFrame from per-column lists with compact numeric dtypes."""
+    data = dict(columns)
+    data["EventID"] = pd.array(columns["EventID"], dtype="Int32")
+    data["EventType"] = pd.array(columns["EventType"], dtype="Int8")
+    return pd.DataFrame(data, columns=EVTX_COLUMNS)
+
+
+def _cache_path(file_path):
+    """Parquet cache location for a log file, keyed by its mtime (ns) and size."""
+    st = os.stat(file_path)
+    return f"{file_path}.{st.st_mtime_ns}-{st.st_size}.parquet"
+
+
+def _read_cache(file_path):
+    """Return the cached DataFrame for an unchanged log file, or None."""
+    if pyarrow is None:
+        return None
     try:
+        cache_path = _cache_path(file_path)
+        if not os.path.exists(cache_path):
+            return None
+        df = pd.read_parquet(cache_path, engine="pyarrow")
+    except Exception:
+        return None
+
+    print(f"[bold green]✓ Loaded {len(df)} cached records for {file_path}[/bold green]")
+    return df
+
+
+def _write_cache(file_path, df):
+    """
+    Save a freshly parsed DataFrame next to its log file (best effort).
+
+    Caches left over from earlier versions of the file are removed, so each
+    log keeps at most one.
+    """
+    if pyarrow is None or df.empty:
+        return
+    try:
+        cache_path = _cache_path(file_path)
+        df.to_parquet(cache_path, engine="pyarrow", compression="zstd", index=False)
+    except Exception:
+        return
+
+    # Older caches are <mtime_ns>-<size>, or <mtime seconds> from before that
+    prefix = f"{file_path}."
+    for stale in glob.glob(f"{glob.escape(file_path)}.*.parquet"):
+        stamp = stale[len(prefix) : -len(".parquet")]
+        if stale != cache_path and stamp.replace("-", "", 1).isdigit():
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def raw_xml_path(file_path):
+    """Location of the raw XML sidecar written by parse_evtx_file(keep_raw=True)."""
+    return f"{file_path}.raw.jsonl.gz"
+
+
+def load_raw_xml(file_path, rows=None):
+    """
+    Read record XML saved by parse_evtx_file(..., keep_raw=True).
+
+    Args:
+        file_path: Path to the .evtx file
+        rows: DataFrame row positions to return (all rows if None)
+
+    Returns:
+        list: XML strings in the requested order, or None without a sidecar
+    """
+    path = raw_xml_path(file_path)
+    if not os.path.exists(path):
+        return None
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        if rows is None:
+            return [json.loads(line) for line in f]
+        wanted = set(rows)
+        found = {i: json.loads(line) for i, line in enumerate(f) if i in wanted}
+    return [found.get(row) for row in rows]
+
+
+def parse_evtx_file(file_path, keep_raw=False):
+    """
+    Parse user-submitted Windows .evtx log file into a structured DataFrame.
+
+    Raw record XML is not kept in the DataFrame. With keep_raw=True it is
+    written to a compressed sidecar (one JSON string per row) that
+    load_raw_xml reads back on demand.
+    """
+    try:
+        if not keep_raw or os.path.exists(raw_xml_path(file_path)):
+            cached = _read_cache(file_path)
+            if cached is not None:
+                return cached
+
         print(f"[cyan]Parsing EVTX file: {file_path}[/cyan]")
 
-        with Evtx(file_path) as log:
-            for record in evtx_file_xml_view(log):
-                try:
-                    # Convert record to string properly
-                    if isinstance(record, bytes):
-                        raw_xml = record.decode("utf-8", errors="ignore")
-                    elif isinstance(record, tuple):
-                        raw_xml = (
-                            record[0].decode("utf-8", errors="ignore")
-                            if isinstance(record[0], bytes)
-                            else str(record[0])
-                        )
-                    else:
-                        raw_xml = str(record)
-
-                    # Parse XML to extract structured data
-                    root = ET.fromstring(
-                        raw_xml if isinstance(raw_xml, (str, bytes)) else record
-                    )
-
-                    # Extract System information
-                    system = root.find(
-                        "{http://schemas.microsoft.com/win/2004/08/events/event}System"
-                    )
-
-                    entry = {
-                        "RawXML": [raw_xml, {}]
-                    }  # Store as tuple format for JSON compatibility
-
-                    if system is not None:
-                        # Event ID
-                        event_id = system.find(
-                            "{http://schemas.microsoft.com/win/2004/08/events/event}EventID"
-                        )
-                        entry["EventID"] = (
-                            int(event_id.text) if event_id is not None else None
-                        )
-
-                        # Time Created
-                        time_created = system.find(
-                            "{http://schemas.microsoft.com/win/2004/08/events/event}TimeCreated"
-                        )
-                        if time_created is not None:
-                            entry["TimeGenerated"] = time_created.get("SystemTime", "")
-                        else:
-                            entry["TimeGenerated"] = None
-
-                        # Provider
-                        provider = system.find(
-                            "{http://schemas.microsoft.com/win/2004/08/events/event}Provider"
-                        )
-                        entry["SourceName"] = (
-                            provider.get("Name", "") if provider is not None else ""
-                        )
-
-                        # Level (severity)
-                        level = system.find(
-                            "{http://schemas.microsoft.com/win/2004/08/events/event}Level"
-                        )
-                        entry["EventType"] = int(level.text) if level is not None else 0
-
-                        # Computer
-                        computer = system.find(
-                            "{http://schemas.microsoft.com/win/2004/08/events/event}Computer"
-                        )
-                        entry["Computer"] = (
-                            computer.text if computer is not None else ""
-                        )
-
-                        # Channel
-                        channel = system.find(
-                            "{http://schemas.microsoft.com/win/2004/08/events/event}Channel"
-                        )
-                        entry["EventCategory"] = (
-                            channel.text if channel is not None else ""
-                        )
-
-                    # Extract EventData (for EventData format)
-                    event_data = root.find(
-                        "{http://schemas.microsoft.com/win/2004/08/events/event}EventData"
-                    )
-                    message_parts = []
-
-                    if event_data is not None:
-                        for data in event_data:
-                            if data.text:
-                                name = data.get("Name", "")
-                                message_parts.append(f"{name}: {data.text}")
-
-                    # Extract UserData (for UserData format events like 1102)
-                    if not message_parts:
-                        user_data = root.find(
-                            "{http://schemas.microsoft.com/win/2004/08/events/event}UserData"
-                        )
-                        if user_data is not None:
-                            # Extract all child elements
-                            for child in user_data.iter():
-                                if child.text and child.text.strip():
-                                    tag = (
-                                        child.tag.split("}")[-1]
-                                        if "}" in child.tag
-                                        else child.tag
-                                    )
-                                    message_parts.append(f"{tag}: {child.text.strip()}")
-
-                    entry["Message"] = (
-                        " | ".join(message_parts)
-                        if message_parts
-                        else "No message data"
-                    )
-
-                    entries.append(entry)
-
-                except Exception as parse_error:
-                    # If XML parsing fails, try to extract at least some basic info
-                    if isinstance(record, bytes):
-                        raw_xml = record.decode("utf-8", errors="ignore")
-                    elif isinstance(record, tuple):
-                        raw_xml = (
-                            record[0].decode("utf-8", errors="ignore")
-                            if isinstance(record[0], bytes)
-                            else str(record[0])
-                        )
-                    else:
-                        raw_xml = str(record)
-
-                    # Try to extract EventID from XML string
-                    event_id = None
-                    computer = ""
-                    time_gen = None
-
-                    try:
-                        import re
-
-                        event_id_match = re.search(
-                            r"<EventID[^>]*>(\d+)</EventID>", raw_xml
-                        )
-                        if event_id_match:
-                            event_id = int(event_id_match.group(1))
-
-                        computer_match = re.search(
-                            r"<Computer>([^<]+)</Computer>", raw_xml
-                        )
-                        if computer_match:
-                            computer = computer_match.group(1)
-
-                        time_match = re.search(r'SystemTime="([^"]+)"', raw_xml)
-                        if time_match:
-                            time_gen = time_match.group(1)
-                    except:
-                        pass
-
-                    entries.append(
-                        {
-                            "RawXML": [raw_xml, {}],
-                            "EventID": event_id,
-                            "TimeGenerated": time_gen,
-                            "SourceName": "",
-                            "EventType": 0,
-                            "EventCategory": "",
-                            "Computer": computer,
-                            "Message": f"Partial parse - Error: {str(parse_error)}",
-                        }
-                    )
+        raw_out = (
+            gzip.open(raw_xml_path(file_path), "wt", encoding="utf-8")
+            if keep_raw
+            else None
+        )
+
+        # Fill one list per column instead of keeping a dict per record
+        columns = {column: [] for column in EVTX_COLUMNS}
+        try:
+            for entry in parse_evtx_file_iter(file_path, keep_raw=keep_raw):
+                for column, values in columns.items():
+                    values.append(entry.get(column))
+                if raw_out is not None:
+                    raw_out.write(json.dumps(entry["RawXML"][0]) + "\n")
+        finally:
+            if raw_out is not None:
+                raw_out.close()
+
+        df = compact_log_frame(_build_evtx_frame(columns), utc=True)
 
         print(
-            f"[bold green]✓ Successfully parsed {len(entries)} records from {file_path}[/bold green]"
+            f"[bold green]✓ Successfully parsed {len(df)} records from {file_path}[/bold green]"
         )
 
-        # Create DataFrame with proper column order
-        df = pd.DataFrame(entries)
-
-        # Reorder columns for better readability
-        column_order = [
-            "TimeGenerated",
-            "EventID",
-            "SourceName",
-            "EventType",
-            "EventCategory",
-            "Computer",
-            "Message",
-            "RawXML",
-        ]
-
-        # Only include columns that exist
-        available_columns = [col for col in column_order if col in df.columns]
-        df = df[available_columns]
-
+        _write_cache(file_path, df)
         return df
 
     except FileNotFoundError:
@@ -211,26 +570,116 @@ def parse_evtx_file(file_path):
         return pd.DataFrame()
 
 
+def parse_evtx_to_parquet(file_path, output_path):
+    """
+    Parse an EVTX file and save it as Parquet for fast columnar reloads.
+
+    Requires pyarrow (pip install pyarrow).
+
+    Args:
+        file_path: Path to the .evtx file
+        output_path: Path of the .parquet file to write
+
+    Returns:
+        str: output_path, or None if parsing or writing failed
+    """
+    df = parse_evtx_file(file_path)
+    if df.empty:
+        return None
+
+    try:
+        df.to_parquet(output_path, index=False)
+        print(f"[cyan]✓ Parquet file saved: {output_path}[/cyan]")
+        return output_path
+    except ImportError:
+        print(
+            "[bold red]✗ Parquet export needs pyarrow. Run: pip install pyarrow[/bold red]"
+        )
+        return None
+    except Exception as e:
+        print(f"[bold red]✗ Error saving Parquet file: {str(e)}[/bold red]")
+        return None
+
+
+def _read_csv(file_path):
+    """Read a CSV with pyarrow's multithreaded parser into Arrow-backed columns."""
+    if pyarrow is not None:
+        try:
+            return pd.read_csv(file_path, engine="pyarrow", dtype_backend="pyarrow")
+        except Exception:
+            pass  # e.g. ragged rows the pyarrow parser rejects
+    return pd.read_csv(file_path)
+
+
 def parse_csv_log(file_path):
     """Parse CSV log files."""
     try:
-        df = pd.read_csv(file_path)
+        cached = _read_cache(file_path)
+        if cached is not None:
+            return cached
+
+        df = compact_log_frame(_read_csv(file_path))
         print(
             f"[bold green]✓ Successfully loaded {len(df)} records from CSV[/bold green]"
         )
+        _write_cache(file_path, df)
         return df
     except Exception as e:
         print(f"[bold red]✗ Error parsing CSV file: {str(e)}[/bold red]")
         return pd.DataFrame()
 
 
+def _is_json_lines(file_path):
+    """
+    True if a JSON file holds one object per line rather than one document.
+
+    The first non-blank line must be a complete JSON object on its own, and
+    the next non-blank line must start another object. A document spread
+    over several lines, or an array, fails the first check. A file with a
+    single object line counts as one record only if its values are scalars,
+    since pandas' column-oriented documents nest one dict per column.
+    """
+    with open(file_path, "rb") as f:
+        lines = (line for line in iter(lambda: f.readline(_JSON_LINE_LIMIT), b""))
+        lines = (line.strip() for line in lines)
+        lines = (line for line in lines if line)
+        first = next(lines, None)
+        if first is None:
+            return False
+        try:
+            record = json.loads(first)
+        except ValueError:
+            return False
+        if not isinstance(record, dict):
+            return False
+        second = next(lines, None)
+    if second is None:
+        return not any(isinstance(value, (dict, list)) for value in record.values())
+    return second.startswith(b"{")
+
+
+def _read_json(file_path):
+    """Read a JSON log, streaming large newline-delimited files in chunks."""
+    if not _is_json_lines(file_path):
+        return pd.read_json(file_path)
+    if os.path.getsize(file_path) >= JSON_CHUNK_THRESHOLD:
+        with pd.read_json(file_path, lines=True, chunksize=JSON_CHUNK_ROWS) as reader:
+            return pd.concat(reader, ignore_index=True)
+    return pd.read_json(file_path, lines=True)
+
+
 def parse_json_log(file_path):
     """Parse JSON log files."""
     try:
-        df = pd.read_json(file_path)
+        cached = _read_cache(file_path)
+        if cached is not None:
+            return cached
+
+        df = compact_log_frame(_read_json(file_path))
         print(
             f"[bold green]✓ Successfully loaded {len(df)} records from JSON[/bold green]"
         )
+        _write_cache(file_path, df)
         return df
     except Exception as e:
         print(f"[bold red]✗ Error parsing JSON file: {str(e)}[/bold red]")
@@ -1,14 +1,90 @@
+import functools
 import win32evtlog  # type: ignore
 import pandas as pd
 from rich import print
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
 from config import MAX_EVENTS
+from modules.utils import compact_log_frame
+
+# Events fetched per EvtNext call
+EVT_BATCH_SIZE = 1024
+
+# Milliseconds EvtNext waits for a batch before giving up
+EVT_NEXT_TIMEOUT = 1000
+
+# Positions in the values rendered with an EvtRenderContextSystem context
+# (the EVT_SYSTEM_PROPERTY_ID enumeration)
+_SYS_PROVIDER_NAME = 0
+_SYS_EVENT_ID = 2
+_SYS_LEVEL = 4
+_SYS_TASK = 5
+_SYS_TIME_CREATED = 8
+_SYS_RECORD_ID = 9
+_SYS_COMPUTER = 15
+
+
+# Column order of the DataFrame built by collect_windows_logs
+LOG_COLUMNS = [
+    "TimeGenerated",
+    "EventID",
+    "SourceName",
+    "EventCategory",
+    "EventType",
+    "Computer",
+    "Message",
+    "RecordNumber",
+]
+
+
+def _build_log_frame(columns):
+    """Build the collected-events DataFrame from per-column lists."""
+    data = dict(columns)
+    data["EventID"] = pd.array(columns["EventID"], dtype="Int32")
+    data["EventType"] = pd.array(columns["EventType"], dtype="Int8")
+    data["RecordNumber"] = pd.array(columns["RecordNumber"], dtype="Int64")
+    return compact_log_frame(pd.DataFrame(data, columns=LOG_COLUMNS), utc=True)
+
+
+def _render_event(event, system_context, user_context):
+    """Render the fields kept for one event, in LOG_COLUMNS order."""
+    system = win32evtlog.EvtRender(
+        event, win32evtlog.EvtRenderEventValues, Context=system_context
+    )
+    inserts = win32evtlog.EvtRender(
+        event, win32evtlog.EvtRenderEventValues, Context=user_context
+    )
+
+    # Each rendered value is a (value, type) pair
+    strings = tuple(value for value, _ in inserts)
+
+    return (
+        system[_SYS_TIME_CREATED][0],
+        system[_SYS_EVENT_ID][0],
+        system[_SYS_PROVIDER_NAME][0],
+        system[_SYS_TASK][0],
+        system[_SYS_LEVEL][0],
+        system[_SYS_COMPUTER][0],
+        str(strings) if strings else "No message",
+        system[_SYS_RECORD_ID][0],
+    )
+
+
+def _total_records(log_type):
+    """Return the number of records in a log, or None if it can't be read."""
+    try:
+        log = win32evtlog.EvtOpenLog(log_type, win32evtlog.EvtOpenChannelPath)
+        return win32evtlog.EvtGetLogInfo(log, win32evtlog.EvtLogNumberOfLogRecords)[0]
+    except Exception:
+        return None
 
 
 def collect_windows_logs(log_type="Security", max_events=MAX_EVENTS):
     """
     Collect Windows event logs directly from system with progress indicator.
 
+    Uses the EvtQuery/EvtNext API, fetching events in batches and rendering
+    only the system fields and insertion strings that are kept.
+
     Args:
         log_type: Type of Windows log to collect (Security, Application, System, etc.)
         max_events: Maximum number of events to collect
@@ -16,24 +92,32 @@ def collect_windows_logs(log_type="Security", max_events=MAX_EVENTS):
     Returns:
         DataFrame containing collected log events
     """
-    server = "localhost"
-    log_handle = None
-    logs = []
+    # Fill one list per column instead of keeping a dict per record
+    columns = {column: [] for column in LOG_COLUMNS}
 
     try:
-        # Open event log
-        log_handle = win32evtlog.OpenEventLog(server, log_type)
+        # Newest events first, like the old backwards sequential read
+        query = win32evtlog.EvtQuery(
+            log_type,
+            win32evtlog.EvtQueryChannelPath | win32evtlog.EvtQueryReverseDirection,
+        )
 
-        # Get total number of records
-        total = win32evtlog.GetNumberOfEventLogRecords(log_handle)
+        # Render contexts are created once and reused for every event
+        system_context = win32evtlog.EvtCreateRenderContext(
+            win32evtlog.EvtRenderContextSystem
+        )
+        user_context = win32evtlog.EvtCreateRenderContext(
+            win32evtlog.EvtRenderContextUser
+        )
+
+        total = _total_records(log_type)
 
         print(f"\n[bold cyan]Collecting Windows '{log_type}' Logs...[/bold cyan]")
-        print(f"[dim]Total available records: {total}[/dim]")
+        print(
+            f"[dim]Total available records: {total if total is not None else 'unknown'}[/dim]"
+        )
         print(f"[dim]Collecting up to: {max_events} events[/dim]")
 
-        flags = (
-            win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
-        )
         events = 0
 
         # Create progress bar
@@ -48,40 +132,40 @@ def collect_windows_logs(log_type="Security", max_events=MAX_EVENTS):
 
             while events < max_events:
                 try:
-                    records = win32evtlog.ReadEventLog(log_handle, flags, 0)
-                    if not records:
+                    batch = win32evtlog.EvtNext(
+                        query,
+                        min(EVT_BATCH_SIZE, max_events - events),
+                        EVT_NEXT_TIMEOUT,
+                    )
+                    if not batch:
                         break
 
-                    for record in records:
-                        try:
-                            events += 1
-
-                            # Extract event data
-                            logs.append(
-                                {
-                                    "TimeGenerated": record.TimeGenerated.Format(),
-                                    "EventID": record.EventID & 0xFFFF,
-                                    "SourceName": record.SourceName,
-                                    "EventCategory": record.EventCategory,
-                                    "EventType": record.EventType,
-                                    "Computer": record.ComputerName,
-                                    "Message": (
-                                        str(record.StringInserts)
-                                        if record.StringInserts
-                                        else "No message"
-                                    ),
-                                    "RecordNumber": record.RecordNumber,
-                                }
-                            )
-
-                            progress.update(task, advance=1)
-
-                            if events >= max_events:
-                                break
-
-                        except Exception as record_error:
-                            # Skip individual records that fail to parse
-                            continue
+                    # A single try per batch keeps exception setup out of the
+                    # per-event loop; only a batch with a bad event falls back
+                    # to rendering the rest of it one event at a time
+                    try:
+                        for failed, event in enumerate(batch):
+                            row = _render_event(event, system_context, user_context)
+                            for values, value in zip(columns.values(), row):
+                                values.append(value)
+                    except Exception:
+                        for event in batch[failed:]:
+                            try:
+                                row = _render_event(event, system_context, user_context)
+                            except Exception as record_error:
+                                print(
+                                    f"[yellow]Warning: Skipping event {len(columns['EventID']) + 1}: {str(record_error)}[/yellow]"
+                                )
+                                continue
+                            for values, value in zip(columns.values(), row):
+                                values.append(value)
+
+                    # Refresh the progress bar once per batch, not per record
+                    events += len(batch)
+                    progress.update(task, advance=len(batch))
+
+                    # Drop the batch so its event handles are closed right away
+                    del batch
 
                 except Exception as read_error:
                     print(
@@ -89,15 +173,16 @@ def collect_windows_logs(log_type="Security", max_events=MAX_EVENTS):
                     )
                     break
 
-        print(f"[bold green]✓ Successfully collected {len(logs)} events[/bold green]")
+        collected = len(columns["EventID"])
+        print(f"[bold green]✓ Successfully collected {collected} events[/bold green]")
 
-        if not logs:
+        if not collected:
             print(
                 "[yellow]⚠️ No logs were collected. This might be a permissions issue.[/yellow]"
             )
             return pd.DataFrame()
 
-        return pd.DataFrame(logs)
+        return _build_log_frame(columns)
 
     except Exception as e:
         print(f"[bold red]✗ Error collecting Windows logs: {str(e)}[/bold red]")
@@ -107,7 +192,9 @@ def collect_windows_logs(log_type="Security", max_events=MAX_EVENTS):
             print(
                 "[yellow]💡 Tip: Run this program as Administrator to access system logs.[/yellow]"
             )
-        elif "The system cannot find the file specified" in str(e):
+        elif "The system cannot find the file specified" in str(
+            e
+        ) or "channel could not be found" in str(e):
             print(
                 f"[yellow]💡 Tip: The log type '{log_type}' might not exist on this system.[/yellow]"
             )
@@ -115,34 +202,31 @@ def collect_windows_logs(log_type="Security", max_events=MAX_EVENTS):
 
         return pd.DataFrame()
 
-    finally:
-        # Always close the log handle
-        if log_handle:
-            try:
-                win32evtlog.CloseEventLog(log_handle)
-            except:
-                pass
-
 
+@functools.lru_cache(maxsize=1)
 def get_available_log_types():
-    """Get list of available Windows event log types."""
-    try:
-        import win32evtlog
+    """
+    Get the Windows event log types that can be opened on this system.
 
-        server = "localhost"
+    Probed once per process; the result is cached since the set of logs
+    doesn't change while the program runs.
 
-        common_logs = ["Security", "Application", "System", "Setup"]
+    Returns:
+        tuple: Names of the available log types
+    """
+    try:
+        common_logs = ("Security", "Application", "System", "Setup")
         available = []
 
         for log_type in common_logs:
             try:
-                handle = win32evtlog.OpenEventLog(server, log_type)
-                win32evtlog.CloseEventLog(handle)
+                # The handle is closed as soon as it is released
+                win32evtlog.EvtOpenLog(log_type, win32evtlog.EvtOpenChannelPath)
                 available.append(log_type)
-            except:
+            except Exception:
                 pass
 
-        return available
+        return tuple(available)
     except Exception as e:
         print(f"[yellow]Could not enumerate log types: {e}[/yellow]")
-        return ["Security", "Application", "System"]
+        return ("Security", "Application", "System")
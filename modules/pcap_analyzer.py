@@ -4,14 +4,116 @@ Generates comprehensive reports from PCAP files without manual interaction.
 """
 
 import os
+import re
+import json
+import hashlib
+import heapq
+import socket
+import struct
 import subprocess
+import threading
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from operator import itemgetter
 from typing import Dict, Any, List
+import numpy as np
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 console = Console()
 
+# Cleartext protocols flagged by detect_security_issues, keyed by their name
+# in tshark's frame.protocols ("smtp" only counts without "tls")
+CLEARTEXT_PROTOCOLS = (
+    ("http", "Unencrypted HTTP traffic detected"),
+    ("ftp", "Unencrypted FTP traffic detected"),
+    ("telnet", "Unencrypted Telnet traffic detected"),
+    ("smtp", "Unencrypted SMTP traffic detected"),
+)
+
+# TCP ports used by well-known backdoors and botnet C&C channels
+SUSPICIOUS_PORTS = (
+    (4444, "Metasploit default port (4444) detected"),
+    (31337, "Back Orifice trojan port (31337) detected"),
+    (12345, "NetBus trojan port (12345) detected"),
+    (6667, "IRC port (6667) - potential botnet C&C"),
+    (1337, "LEET port (1337) - potential backdoor"),
+)
+
+# Packet patterns reported by get_suspicious_patterns
+SUSPICIOUS_PATTERNS = (
+    (
+        "large_icmp",
+        "⚠️ Large ICMP packets detected (potential data exfiltration)",
+    ),
+    ("dns_executable", "⚠️ Suspicious DNS queries for executables"),
+    ("syn", "🔍 SYN packets detected (potential port scanning)"),
+    ("post_password", "🔴 Potential password in HTTP POST"),
+)
+
+# Fields extracted by the single tshark pass shared by the report sections
+# (http.file_data last, as it is by far the longest)
+_DISSECT_FIELDS = (
+    "frame.protocols",
+    "frame.len",
+    "ip.src",
+    "ip.dst",
+    "tcp.srcport",
+    "tcp.dstport",
+    "tcp.flags",
+    "data.len",
+    "dns.qry.name",
+    "http.request.method",
+    "http.host",
+    "http.request.uri",
+    "tls.handshake.type",
+    "tls.handshake.version",
+    "tls.handshake.extensions_server_name",
+    "http.file_data",
+)
+
+# Classic libpcap magic numbers: (byte order, timestamp fraction units/second)
+_PCAP_MAGICS = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e9),  # nanosecond timestamps
+    b"\xa1\xb2\x3c\x4d": (">", 1e9),
+}
+
+# Patterns read from tshark's "io,stat,0" summary: a frame count ("42 frames"
+# or the interval table's Frames cell) and the first/last packet times
+_FRAMES_RE = re.compile(r"(\d[\d,]*)\s+frames?\b", re.IGNORECASE)
+_IO_ROW_RE = re.compile(r"<>\s*\S+\s*\|\s*(\d+)\s*\|")
+_FIRST_PACKET_RE = re.compile(r"first packet[^:]*:(.*)", re.IGNORECASE)
+_LAST_PACKET_RE = re.compile(r"last packet[^:]*:(.*)", re.IGNORECASE)
+
+# Unique DNS query names kept for the report
+DNS_QUERY_LIMIT = 50
+
+# Seconds the single dissection pass may run before tshark is killed, so a
+# hung tshark cannot hold _dissect_lock (and every report section) forever
+DISSECT_TIMEOUT = float(os.getenv("PCAP_DISSECT_TIMEOUT", "600"))
+
+# "password" as tshark prints it when http.file_data is shown as hex bytes
+_PASSWORD_HEX = b"password".hex().encode("ascii")
+
+# Last dissection per capture, keyed by (path, size, mtime). A failed pass is
+# stored as its exception, so the other sections fail fast instead of each
+# running tshark (and waiting out DISSECT_TIMEOUT) again.
+_dissect_cache = {}
+_dissect_lock = threading.Lock()  # concurrent report sections share one pass
+
+# Set when an analysis fell back to its defaults, so its result is not cached
+_analysis_state = threading.local()
+
+
+def _warn_failed(message: str):
+    """Report an analysis failure and mark the current result as incomplete."""
+    _analysis_state.failed = True
+    console.print(f"[yellow]Warning: {message}[/yellow]")
+
 
 def check_tshark_installed() -> bool:
     """Check if tshark is installed."""
@@ -24,6 +126,90 @@ def check_tshark_installed() -> bool:
         return False
 
 
+def _iter_tshark(cmd: List[str], timeout: float = None, text: bool = True):
+    """
+    Run tshark and yield its stdout line by line as it is produced.
+
+    Output is never buffered whole, so memory stays at the pipe buffer
+    regardless of capture size. Stopping the iteration early kills tshark.
+
+    Args:
+        cmd: tshark command line
+        timeout: Seconds before tshark is killed (None for no limit)
+        text: Decode lines to str (False yields the raw bytes lines)
+
+    Raises:
+        subprocess.TimeoutExpired: If tshark ran past the timeout
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        bufsize=1 << 16,
+        text=text,
+        encoding="utf-8" if text else None,
+        errors="ignore" if text else None,
+    )
+    timed_out = threading.Event()  # set only when the timer did the killing
+
+    def _kill():
+        if proc.poll() is None:
+            timed_out.set()
+            proc.kill()
+
+    timer = threading.Timer(timeout, _kill) if timeout else None
+    if timer:
+        timer.start()
+    try:
+        yield from proc.stdout
+    finally:
+        if timer:
+            timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+
+def _scan_pcap_records(pcap_file: str):
+    """
+    Count packets and read the capture's time span without dissecting it.
+
+    Only the 16-byte record headers of a classic libpcap file are read;
+    packet data is skipped with a seek.
+
+    Args:
+        pcap_file: Path to the capture
+
+    Returns:
+        tuple: (packet count, first timestamp, last timestamp) in epoch
+        seconds, or None if the file is not a classic pcap (e.g. pcapng)
+    """
+    with open(pcap_file, "rb") as f:
+        layout = _PCAP_MAGICS.get(f.read(24)[:4])
+        if layout is None:
+            return None
+        byte_order, units = layout
+        record = struct.Struct(f"{byte_order}IIII")
+
+        count = 0
+        first = last = None
+        while True:
+            header = f.read(16)
+            if len(header) < 16:
+                break
+            ts_sec, ts_frac, caplen, _ = record.unpack(header)
+            last = ts_sec + ts_frac / units
+            if first is None:
+                first = last
+            count += 1
+            f.seek(caplen, 1)
+
+    return count, first, last
+
+
 def get_basic_stats(pcap_file: str) -> Dict[str, Any]:
     """Get basic statistics from PCAP file."""
     stats = {
@@ -36,104 +222,275 @@ def get_basic_stats(pcap_file: str) -> Dict[str, Any]:
     }
 
     try:
-        # Get packet count and timing
+        scanned = _scan_pcap_records(pcap_file)
+        if scanned is not None:
+            count, first, last = scanned
+            stats["packet_count"] = count
+            if count:
+                stats["start_time"] = str(datetime.fromtimestamp(first))
+                stats["end_time"] = str(datetime.fromtimestamp(last))
+                stats["duration"] = f"{last - first:.3f} seconds"
+            return stats
+
+        # Other formats (pcapng): get packet count and timing from tshark
         cmd = ["tshark", "-r", pcap_file, "-q", "-z", "io,stat,0"]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            timeout=30,
-        )
-
-        if result.stdout:
-            for line in result.stdout.split("\n"):
-                if "frames" in line.lower():
-                    parts = line.split()
-                    for i, part in enumerate(parts):
-                        if "frames" in part.lower() and i > 0:
-                            try:
-                                stats["packet_count"] = int(parts[i - 1])
-                            except ValueError:
-                                pass
-                if "first packet" in line.lower():
-                    stats["start_time"] = (
-                        line.split(":", 1)[1].strip() if ":" in line else ""
-                    )
-                if "last packet" in line.lower():
-                    stats["end_time"] = (
-                        line.split(":", 1)[1].strip() if ":" in line else ""
-                    )
+        for line in _iter_tshark(cmd, timeout=30):
+            match = _FRAMES_RE.search(line) or _IO_ROW_RE.search(line)
+            if match:
+                stats["packet_count"] = int(match.group(1).replace(",", ""))
+                continue
+            match = _FIRST_PACKET_RE.search(line)
+            if match:
+                stats["start_time"] = match.group(1).strip()
+                continue
+            match = _LAST_PACKET_RE.search(line)
+            if match:
+                stats["end_time"] = match.group(1).strip()
     except Exception as e:
-        console.print(f"[yellow]Warning: Could not get basic stats: {e}[/yellow]")
+        _warn_failed(f"Could not get basic stats: {e}")
 
     return stats
 
 
+def _parse_protocol_hierarchy(lines) -> List[Dict[str, Any]]:
+    """Read the rows of tshark's "io,phs" statistics table."""
+    protocols = []
+    in_data = False
+    for line in lines:
+        if "Protocol Hierarchy Statistics" in line:
+            in_data = True
+            continue
+        if in_data and line.strip() and not line.startswith("="):
+            parts = line.split()
+            if len(parts) >= 2:
+                protocols.append(
+                    {
+                        "protocol": parts[0].strip(),
+                        "frames": parts[1] if len(parts) > 1 else "0",
+                    }
+                )
+    return protocols
+
+
 def get_protocol_hierarchy(pcap_file: str) -> List[Dict[str, Any]]:
     """Get protocol hierarchy statistics."""
     protocols = []
 
     try:
-        cmd = ["tshark", "-r", pcap_file, "-q", "-z", "io,phs"]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            timeout=30,
-        )
-
-        if result.stdout:
-            in_data = False
-            for line in result.stdout.split("\n"):
-                if "Protocol Hierarchy Statistics" in line:
-                    in_data = True
-                    continue
-                if in_data and line.strip() and not line.startswith("="):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        protocols.append(
-                            {
-                                "protocol": parts[0].strip(),
-                                "frames": parts[1] if len(parts) > 1 else "0",
-                            }
-                        )
+        protocols = list(_dissect_pcap(pcap_file)["protocols"])
     except Exception as e:
-        console.print(
-            f"[yellow]Warning: Could not get protocol hierarchy: {e}[/yellow]"
-        )
+        _warn_failed(f"Could not get protocol hierarchy: {e}")
 
     return protocols
 
 
+def _first_int(value: bytes, base=10):
+    """Parse the first of tshark's comma-separated field values, or None."""
+    value = value.split(b",", 1)[0]
+    try:
+        return int(value, base) if value else None
+    except ValueError:
+        return None
+
+
+def _dissect_pcap(pcap_file: str) -> Dict[str, Any]:
+    """
+    Dissect a capture once and collect what every packet-level section needs.
+
+    Endpoints, HTTP, DNS, TLS, conversations, the security rules and the
+    protocol hierarchy are all gathered from one streamed tshark pass
+    instead of a tshark process (and full re-dissection) per section. The
+    result, or the error of a failed pass, is reused until the file changes
+    or _forget_failed_dissection is called.
+
+    Returns:
+        dict: Aggregates read by the get_* / detect_* functions
+
+    Raises:
+        Exception: The error of the (possibly earlier) failed tshark pass
+    """
+    st = os.stat(pcap_file)
+    key = (pcap_file, st.st_size, st.st_mtime_ns)
+    with _dissect_lock:
+        if key not in _dissect_cache:
+            try:
+                summary = _run_dissection(pcap_file)
+            except Exception as e:
+                summary = e
+            _dissect_cache.clear()
+            _dissect_cache[key] = summary
+        summary = _dissect_cache[key]
+    if isinstance(summary, Exception):
+        raise summary
+    return summary
+
+
+def _forget_failed_dissection():
+    """Drop a stored dissection failure so the next report tries tshark again."""
+    with _dissect_lock:
+        for key, summary in list(_dissect_cache.items()):
+            if isinstance(summary, Exception):
+                del _dissect_cache[key]
+
+
+def _text(value: bytes) -> str:
+    """Decode a raw tshark field value."""
+    return value.decode("utf-8", "ignore")
+
+
+def _ipv4_to_int(address: bytes) -> int:
+    """Pack a dotted-quad IPv4 address into an unsigned 32-bit integer."""
+    return int.from_bytes(socket.inet_aton(address.decode("ascii", "ignore")), "big")
+
+
+def _aggregate_conversations(sources, destinations, lengths) -> Dict:
+    """
+    Total packets and bytes per IP pair, counting both directions together.
+
+    Each unordered address pair is packed into one uint64 key, so grouping
+    is a single np.unique call instead of a dict update per packet.
+
+    Args:
+        sources: Source address of each packet as a 32-bit integer
+        destinations: Destination address of each packet
+        lengths: Frame length of each packet
+
+    Returns:
+        dict: (source, destination) -> [packets, bytes], oriented and ordered
+        by each pair's first packet
+    """
+    src = np.asarray(sources, dtype=np.uint64)
+    dst = np.asarray(destinations, dtype=np.uint64)
+    keys = (np.minimum(src, dst) << np.uint64(32)) | np.maximum(src, dst)
+    _, first, inverse, packets = np.unique(
+        keys, return_index=True, return_inverse=True, return_counts=True
+    )
+    sizes = np.bincount(inverse.ravel(), weights=np.asarray(lengths, dtype=np.float64))
+
+    conversations = {}
+    for i in np.argsort(first, kind="stable"):
+        pair = (
+            socket.inet_ntoa(int(src[first[i]]).to_bytes(4, "big")),
+            socket.inet_ntoa(int(dst[first[i]]).to_bytes(4, "big")),
+        )
+        conversations[pair] = [int(packets[i]), int(sizes[i])]
+    return conversations
+
+
+def _run_dissection(pcap_file: str) -> Dict[str, Any]:
+    """
+    Stream one tshark pass over a capture and aggregate its packets.
+
+    Rows are split as bytes and only the fields that are kept as text are
+    decoded; numbers and protocol names are compared as bytes.
+    """
+    cmd = ["tshark", "-r", pcap_file, "-z", "io,phs"]
+    cmd += ["-T", "fields", "-E", "separator=\t"]
+    for field in _DISSECT_FIELDS:
+        cmd += ["-e", field]
+
+    counts = Counter()  # packets matching each security rule
+    ipv4 = {}  # insertion-ordered set of addresses (bytes)
+    # Per-packet address pairs and sizes, grouped into conversations at the end
+    sources, destinations, lengths = array("L"), array("L"), array("Q")
+    http_requests = []
+    dns_queries = {}  # first DNS_QUERY_LIMIT unique names, in order seen
+    tls_hellos = []  # (version, server name) per ClientHello
+    watched_ports = {port for port, _ in SUSPICIOUS_PORTS}
+    stats_lines = []  # io,phs table, printed after the last packet row
+
+    for line in _iter_tshark(cmd, timeout=DISSECT_TIMEOUT, text=False):
+        if stats_lines or line.startswith(b"="):
+            stats_lines.append(_text(line))
+            continue
+        parts = line.rstrip(b"\r\n").split(b"\t")
+        if len(parts) < len(_DISSECT_FIELDS):
+            parts += [b""] * (len(_DISSECT_FIELDS) - len(parts))
+        (
+            protocols,
+            frame_len,
+            ip_src,
+            ip_dst,
+            srcport,
+            dstport,
+            flags,
+            data_len,
+            query,
+            method,
+            host,
+            uri,
+            hs_type,
+            hs_version,
+            sni,
+            body,
+        ) = parts[: len(_DISSECT_FIELDS)]
+
+        # Endpoints and conversations
+        if ip_src and ip_dst:
+            for address in ip_src.split(b",") + ip_dst.split(b","):
+                ipv4[address] = None
+            try:
+                src = _ipv4_to_int(ip_src.split(b",", 1)[0])
+                dst = _ipv4_to_int(ip_dst.split(b",", 1)[0])
+            except OSError:
+                pass
+            else:
+                sources.append(src)
+                destinations.append(dst)
+                lengths.append(_first_int(frame_len) or 0)
+
+        # Application protocols
+        if method:
+            http_requests.append((_text(method), _text(host), _text(uri)))
+        if query and len(dns_queries) < DNS_QUERY_LIMIT:
+            dns_queries[_text(query)] = None
+        if b"1" in hs_type.split(b","):
+            tls_hellos.append((_text(hs_version), _text(sni)))
+
+        # Security rules
+        layers = set(protocols.split(b":"))
+        for name in (b"http", b"ftp", b"telnet"):
+            if name in layers:
+                counts[name.decode()] += 1
+        if b"smtp" in layers and b"tls" not in layers:
+            counts["smtp"] += 1
+
+        for port in {_first_int(srcport), _first_int(dstport)} & watched_ports:
+            counts[port] += 1
+
+        if b"icmp" in layers and (_first_int(data_len) or 0) > 48:
+            counts["large_icmp"] += 1
+        if query:
+            query = query.lower()
+            if b"exe" in query or b"dll" in query:
+                counts["dns_executable"] += 1
+        tcp_flags = _first_int(flags, 16)
+        if tcp_flags is not None and tcp_flags & 0x12 == 0x02:
+            counts["syn"] += 1
+        if b"POST" in method.split(b","):
+            body = body.lower()
+            if b"password" in body or _PASSWORD_HEX in body:
+                counts["post_password"] += 1
+
+    return {
+        "counts": counts,
+        "ipv4": [_text(address) for address in ipv4],
+        "conversations": _aggregate_conversations(sources, destinations, lengths),
+        "http_requests": http_requests,
+        "dns_queries": list(dns_queries),
+        "tls_hellos": tls_hellos,
+        "protocols": _parse_protocol_hierarchy(stats_lines),
+    }
+
+
 def get_endpoints(pcap_file: str) -> Dict[str, List[str]]:
     """Get IP endpoints."""
     endpoints = {"ipv4": [], "ipv6": []}
 
     try:
-        cmd = ["tshark", "-r", pcap_file, "-q", "-z", "endpoints,ip"]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            timeout=30,
-        )
-
-        if result.stdout:
-            for line in result.stdout.split("\n"):
-                if line.strip() and not line.startswith("=") and "." in line:
-                    parts = line.split()
-                    if parts:
-                        ip = parts[0].strip()
-                        if ip and ip[0].isdigit():
-                            endpoints["ipv4"].append(ip)
+        endpoints["ipv4"] = list(_dissect_pcap(pcap_file)["ipv4"])
     except Exception as e:
-        console.print(f"[yellow]Warning: Could not get endpoints: {e}[/yellow]")
+        _warn_failed(f"Could not get endpoints: {e}")
 
     return endpoints
 
@@ -143,50 +500,16 @@ def get_http_summary(pcap_file: str) -> Dict[str, Any]:
     http_data = {"requests": [], "total_requests": 0, "methods": {}, "status_codes": {}}
 
     try:
-        # HTTP requests
-        cmd = [
-            "tshark",
-            "-r",
-            pcap_file,
-            "-Y",
-            "http.request",
-            "-T",
-            "fields",
-            "-e",
-            "http.request.method",
-            "-e",
-            "http.host",
-            "-e",
-            "http.request.uri",
-        ]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            timeout=30,
-        )
-
-        if result.stdout:
-            for line in result.stdout.strip().split("\n"):
-                if line:
-                    parts = line.split("\t")
-                    if len(parts) >= 3:
-                        method = parts[0]
-                        host = parts[1]
-                        uri = parts[2]
-                        http_data["requests"].append(
-                            {"method": method, "host": host, "uri": uri}
-                        )
-                        http_data["methods"][method] = (
-                            http_data["methods"].get(method, 0) + 1
-                        )
+        methods = Counter()
+        for method, host, uri in _dissect_pcap(pcap_file)["http_requests"]:
+            http_data["requests"].append({"method": method, "host": host, "uri": uri})
+            methods[method] += 1
 
+        http_data["methods"] = dict(methods)
         http_data["total_requests"] = len(http_data["requests"])
 
     except Exception as e:
-        console.print(f"[yellow]Warning: Could not get HTTP summary: {e}[/yellow]")
+        _warn_failed(f"Could not get HTTP summary: {e}")
 
     return http_data
 
@@ -196,33 +519,9 @@ def get_dns_queries(pcap_file: str) -> List[str]:
     queries = []
 
     try:
-        cmd = [
-            "tshark",
-            "-r",
-            pcap_file,
-            "-Y",
-            "dns.qry.name",
-            "-T",
-            "fields",
-            "-e",
-            "dns.qry.name",
-        ]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            timeout=30,
-        )
-
-        if result.stdout:
-            queries = [
-                q.strip() for q in result.stdout.strip().split("\n") if q.strip()
-            ]
-            queries = list(set(queries))[:50]  # Unique, limit to 50
+        queries = list(_dissect_pcap(pcap_file)["dns_queries"])
     except Exception as e:
-        console.print(f"[yellow]Warning: Could not get DNS queries: {e}[/yellow]")
+        _warn_failed(f"Could not get DNS queries: {e}")
 
     return queries
 
@@ -232,51 +531,20 @@ def detect_security_issues(pcap_file: str) -> List[str]:
     issues = []
 
     try:
+        counts = _dissect_pcap(pcap_file)["counts"]
+
         # Check for unencrypted protocols
-        sensitive_protocols = {
-            "http": "Unencrypted HTTP traffic detected",
-            "ftp": "Unencrypted FTP traffic detected",
-            "telnet": "Unencrypted Telnet traffic detected",
-            "smtp and not tls": "Unencrypted SMTP traffic detected",
-        }
-
-        for protocol, message in sensitive_protocols.items():
-            cmd = ["tshark", "-r", pcap_file, "-Y", protocol, "-c", "1"]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="ignore",
-                timeout=10,
-            )
-            if result.returncode == 0 and result.stdout.strip():
+        for protocol, message in CLEARTEXT_PROTOCOLS:
+            if counts[protocol]:
                 issues.append(f"⚠️ {message}")
 
         # Check for suspicious ports
-        suspicious_ports = [
-            ("tcp.port == 4444", "Metasploit default port (4444) detected"),
-            ("tcp.port == 31337", "Back Orifice trojan port (31337) detected"),
-            ("tcp.port == 12345", "NetBus trojan port (12345) detected"),
-            ("tcp.port == 6667", "IRC port (6667) - potential botnet C&C"),
-            ("tcp.port == 1337", "LEET port (1337) - potential backdoor"),
-        ]
-
-        for filter_exp, message in suspicious_ports:
-            cmd = ["tshark", "-r", pcap_file, "-Y", filter_exp, "-c", "1"]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="ignore",
-                timeout=10,
-            )
-            if result.returncode == 0 and result.stdout.strip():
+        for port, message in SUSPICIOUS_PORTS:
+            if counts[port]:
                 issues.append(f"🔴 {message}")
 
     except Exception as e:
-        console.print(f"[yellow]Warning: Security check incomplete: {e}[/yellow]")
+        _warn_failed(f"Security check incomplete: {e}")
 
     if not issues:
         issues.append("✅ No obvious security issues detected")
@@ -294,48 +562,22 @@ def get_tls_info(pcap_file: str) -> Dict[str, Any]:
     }
 
     try:
-        # TLS versions
-        cmd = [
-            "tshark",
-            "-r",
-            pcap_file,
-            "-Y",
-            "tls.handshake.type == 1",
-            "-T",
-            "fields",
-            "-e",
-            "tls.handshake.version",
-            "-e",
-            "tls.handshake.extensions_server_name",
-        ]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            timeout=30,
-        )
-
-        if result.stdout:
-            lines = result.stdout.strip().split("\n")
-            tls_data["total_connections"] = len([l for l in lines if l.strip()])
-
-            for line in lines:
-                if line.strip():
-                    parts = line.split("\t")
-                    if parts[0]:
-                        version = parts[0].strip()
-                        tls_data["versions"][version] = (
-                            tls_data["versions"].get(version, 0) + 1
-                        )
-                    if len(parts) > 1 and parts[1]:
-                        sni = parts[1].strip()
-                        if sni and sni not in tls_data["server_names"]:
-                            tls_data["server_names"].append(sni)
+        hellos = _dissect_pcap(pcap_file)["tls_hellos"]
+        tls_data["total_connections"] = len(hellos)
+        seen_names = set()  # O(1) membership; the list keeps first-seen order
+
+        for version, sni in hellos:
+            if version:
+                version = version.strip()
+                tls_data["versions"][version] = tls_data["versions"].get(version, 0) + 1
+            if sni:
+                sni = sni.strip()
+                if sni and sni not in seen_names:
+                    seen_names.add(sni)
+                    tls_data["server_names"].append(sni)
 
     except Exception as e:
-        console.print(f"[yellow]Warning: Could not analyze TLS: {e}[/yellow]")
+        _warn_failed(f"Could not analyze TLS: {e}")
 
     return tls_data
 
@@ -345,90 +587,218 @@ def get_top_talkers(pcap_file: str) -> List[Dict[str, Any]]:
     talkers = []
 
     try:
-        cmd = ["tshark", "-r", pcap_file, "-q", "-z", "conv,ip"]
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="ignore",
-            timeout=30,
-        )
+        for (src, dst), (packets, size) in _dissect_pcap(pcap_file)[
+            "conversations"
+        ].items():
+            talkers.append({"src": src, "dst": dst, "packets": packets, "bytes": size})
 
-        if result.stdout:
-            in_data = False
-            for line in result.stdout.split("\n"):
-                if "<->" in line:
-                    in_data = True
-                if in_data and "<->" in line:
-                    parts = line.split()
-                    if len(parts) >= 7:
-                        try:
-                            talkers.append(
-                                {
-                                    "src": parts[0],
-                                    "dst": parts[2],
-                                    "packets": int(parts[3]),
-                                    "bytes": int(parts[4]),
-                                }
-                            )
-                        except (ValueError, IndexError):
-                            pass
-
-            # Sort by packet count
-            talkers.sort(key=lambda x: x["packets"], reverse=True)
+        # Keep the top 10 by packet count without sorting every conversation
+        talkers = heapq.nlargest(10, talkers, key=itemgetter("packets"))
 
     except Exception as e:
-        console.print(f"[yellow]Warning: Could not get top talkers: {e}[/yellow]")
+        _warn_failed(f"Could not get top talkers: {e}")
 
-    return talkers[:10]  # Top 10
+    return talkers
 
 
 def get_suspicious_patterns(pcap_file: str) -> List[str]:
     """Detect suspicious network patterns."""
     patterns = []
 
-    checks = [
-        (
-            "icmp and data.len > 48",
-            "⚠️ Large ICMP packets detected (potential data exfiltration)",
-        ),
-        (
-            'dns.qry.name contains "exe" or dns.qry.name contains "dll"',
-            "⚠️ Suspicious DNS queries for executables",
-        ),
-        (
-            "tcp.flags.syn == 1 and tcp.flags.ack == 0",
-            "🔍 SYN packets detected (potential port scanning)",
-        ),
-        (
-            'http.request.method == "POST" and http.file_data contains "password"',
-            "🔴 Potential password in HTTP POST",
-        ),
-    ]
-
     try:
-        for filter_exp, message in checks:
-            cmd = ["tshark", "-r", pcap_file, "-Y", filter_exp, "-c", "5"]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="ignore",
-                timeout=15,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                count = len(result.stdout.strip().split("\n"))
-                patterns.append(f"{message} ({count}+ occurrences)")
+        counts = _dissect_pcap(pcap_file)["counts"]
+        for name, message in SUSPICIOUS_PATTERNS:
+            if counts[name]:
+                patterns.append(f"{message} ({counts[name]} occurrences)")
 
     except Exception as e:
-        console.print(f"[yellow]Warning: Pattern detection incomplete: {e}[/yellow]")
+        _warn_failed(f"Pattern detection incomplete: {e}")
 
     return patterns
 
 
-def generate_report(pcap_file: str, output_dir: str) -> str:
+# Subdirectory of the report directory holding cached analysis results
+RESULT_CACHE_DIR = ".cache"
+
+# Bump when an analysis or its result format changes, so results cached by
+# an older build are not reused
+RESULT_CACHE_VERSION = 1
+
+
+def _capture_stamp(pcap_file: str) -> Dict[str, Any]:
+    """Identity of one version of a capture (path, size and mtime)."""
+    st = os.stat(pcap_file)
+    return {
+        "pcap": os.path.abspath(pcap_file),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+def _fingerprint(stamp: Dict[str, Any]) -> str:
+    """Cache key for a capture stamp under the current RESULT_CACHE_VERSION."""
+    ident = (
+        f"{RESULT_CACHE_VERSION}:{stamp['pcap']}:{stamp['size']}:{stamp['mtime_ns']}"
+    )
+    return hashlib.blake2b(ident.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _matches(entry, stamp: Dict[str, Any]) -> bool:
+    """True if a cache entry is from this version and for this capture stamp."""
+    return (
+        isinstance(entry, dict)
+        and entry.get("version") == RESULT_CACHE_VERSION
+        and all(entry.get(field) == value for field, value in stamp.items())
+    )
+
+
+def _is_current(entry) -> bool:
+    """True if a cache entry can still be used (its capture is unchanged)."""
+    try:
+        return _matches(entry, _capture_stamp(entry["pcap"]))
+    except (OSError, KeyError, TypeError):
+        return False
+
+
+def _prune_result_cache(cache_dir: str):
+    """
+    Delete cached results that can no longer be used.
+
+    That covers results from another RESULT_CACHE_VERSION, results for
+    captures that were deleted or modified, unreadable files and pickles
+    left by older builds.
+    """
+    try:
+        with os.scandir(cache_dir) as entries:
+            paths = [entry.path for entry in entries if entry.is_file()]
+    except OSError:
+        return
+
+    for path in paths:
+        if path.endswith(".json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    if _is_current(json.load(f)):
+                        continue
+            except (OSError, ValueError):
+                pass
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _cached(cache_dir: str, name: str, stamp: Dict[str, Any], analysis, pcap_file: str):
+    """
+    Run one analysis, reusing its result from an earlier run.
+
+    Results are stored as JSON along with the capture stamp, and are only
+    read back while the stamp and RESULT_CACHE_VERSION still match. Results
+    from a run that failed (and returned its defaults instead) are not
+    stored, so a later run tries again.
+
+    Args:
+        cache_dir: Cache directory, or None to always run the analysis
+        name: ANALYSIS_STAGES name of the analysis
+        stamp: Capture identity from _capture_stamp
+        analysis: Analysis function
+        pcap_file: Path to the capture
+
+    Returns:
+        The analysis result
+    """
+    if cache_dir is None:
+        return analysis(pcap_file)
+
+    path = os.path.join(cache_dir, f"{_fingerprint(stamp)}_{name}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        if _matches(entry, stamp) and "result" in entry:
+            return entry["result"]
+    except (OSError, ValueError):
+        pass
+
+    _analysis_state.failed = False
+    result = analysis(pcap_file)
+    if not _analysis_state.failed:
+        entry = dict(stamp, version=RESULT_CACHE_VERSION, result=result)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            pass  # the cache is optional
+    return result
+
+
+# Analyses behind each report section: (result name, progress text, function)
+ANALYSIS_STAGES = (
+    ("stats", "Collecting basic statistics", get_basic_stats),
+    ("protocols", "Analyzing protocol hierarchy", get_protocol_hierarchy),
+    ("endpoints", "Extracting IP endpoints", get_endpoints),
+    ("http_data", "Analyzing HTTP traffic", get_http_summary),
+    ("dns_queries", "Extracting DNS queries", get_dns_queries),
+    ("issues", "Checking for security issues", detect_security_issues),
+    ("tls_data", "Analyzing TLS/SSL traffic", get_tls_info),
+    ("talkers", "Identifying top talkers", get_top_talkers),
+    ("patterns", "Detecting suspicious patterns", get_suspicious_patterns),
+)
+
+
+def _run_analyses(
+    pcap_file: str, max_workers: int = None, cache_dir: str = None
+) -> Dict[str, Any]:
+    """
+    Run every report section's analysis concurrently.
+
+    Each analysis is an independent read-only tshark run, so they go to a
+    thread pool and the report waits for the slowest one rather than the
+    sum of all of them.
+
+    Args:
+        pcap_file: Path to the capture
+        max_workers: Thread count (defaults to one per analysis, at most 8;
+            lower it for captures on slow spinning disks)
+        cache_dir: Directory for cached results (None disables the cache)
+
+    Returns:
+        dict: Result of each analysis keyed by its ANALYSIS_STAGES name
+    """
+    workers = max_workers or min(8, len(ANALYSIS_STAGES))
+    _forget_failed_dissection()  # retry once per report, e.g. after a tshark install
+    stamp = None
+    if cache_dir is not None:
+        try:
+            stamp = _capture_stamp(pcap_file)
+        except OSError:
+            cache_dir = None
+        else:
+            _prune_result_cache(cache_dir)
+    results = {}
+
+    with Progress(
+        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
+    ) as progress, ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for name, description, analysis in ANALYSIS_STAGES:
+            task = progress.add_task(f"[cyan]{description}...", total=1)
+            future = executor.submit(
+                _cached, cache_dir, name, stamp, analysis, pcap_file
+            )
+            futures[future] = (name, task)
+
+        for future in as_completed(futures):
+            name, task = futures[future]
+            results[name] = future.result()
+            progress.update(task, completed=1)
+
+    return results
+
+
+def generate_report(pcap_file: str, output_dir: str, max_workers: int = None) -> str:
     """Generate comprehensive PCAP analysis report."""
 
     if not check_tshark_installed():
@@ -441,6 +811,19 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     console.print("\n[bold cyan]═══ Automatic PCAP Analysis ═══[/bold cyan]")
     console.print(f"[dim]Analyzing: {os.path.basename(pcap_file)}[/dim]\n")
 
+    results = _run_analyses(
+        pcap_file, max_workers, os.path.join(output_dir, RESULT_CACHE_DIR)
+    )
+    stats = results["stats"]
+    protocols = results["protocols"]
+    endpoints = results["endpoints"]
+    http_data = results["http_data"]
+    dns_queries = results["dns_queries"]
+    issues = results["issues"]
+    tls_data = results["tls_data"]
+    talkers = results["talkers"]
+    patterns = results["patterns"]
+
     report_lines = []
 
     # Header
@@ -453,13 +836,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # Basic Statistics
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Collecting basic statistics...", total=None)
-        stats = get_basic_stats(pcap_file)
-        progress.update(task, completed=True)
-
     report_lines.append("📊 BASIC STATISTICS")
     report_lines.append("-" * 80)
     report_lines.append(f"File Name      : {stats['file_name']}")
@@ -470,13 +846,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # Protocol Hierarchy
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Analyzing protocol hierarchy...", total=None)
-        protocols = get_protocol_hierarchy(pcap_file)
-        progress.update(task, completed=True)
-
     report_lines.append("🌐 PROTOCOL HIERARCHY")
     report_lines.append("-" * 80)
     if protocols:
@@ -487,13 +856,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # Endpoints
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Extracting IP endpoints...", total=None)
-        endpoints = get_endpoints(pcap_file)
-        progress.update(task, completed=True)
-
     report_lines.append("🖥️  IP ENDPOINTS")
     report_lines.append("-" * 80)
     if endpoints["ipv4"]:
@@ -506,13 +868,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # HTTP Analysis
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Analyzing HTTP traffic...", total=None)
-        http_data = get_http_summary(pcap_file)
-        progress.update(task, completed=True)
-
     report_lines.append("🌍 HTTP TRAFFIC ANALYSIS")
     report_lines.append("-" * 80)
     report_lines.append(f"Total HTTP Requests: {http_data['total_requests']}")
@@ -527,13 +882,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # DNS Queries
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Extracting DNS queries...", total=None)
-        dns_queries = get_dns_queries(pcap_file)
-        progress.update(task, completed=True)
-
     report_lines.append("🔍 DNS QUERIES")
     report_lines.append("-" * 80)
     if dns_queries:
@@ -546,13 +894,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # Security Issues
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Checking for security issues...", total=None)
-        issues = detect_security_issues(pcap_file)
-        progress.update(task, completed=True)
-
     report_lines.append("🔒 SECURITY FINDINGS")
     report_lines.append("-" * 80)
     for issue in issues:
@@ -560,13 +901,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # TLS/SSL Analysis
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Analyzing TLS/SSL traffic...", total=None)
-        tls_data = get_tls_info(pcap_file)
-        progress.update(task, completed=True)
-
     report_lines.append("🔐 TLS/SSL ANALYSIS")
     report_lines.append("-" * 80)
     report_lines.append(f"Total TLS Connections: {tls_data['total_connections']}")
@@ -583,13 +917,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # Top Talkers
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Identifying top talkers...", total=None)
-        talkers = get_top_talkers(pcap_file)
-        progress.update(task, completed=True)
-
     report_lines.append("💬 TOP CONVERSATIONS")
     report_lines.append("-" * 80)
     if talkers:
@@ -604,13 +931,6 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
     report_lines.append("")
 
     # Suspicious Patterns
-    with Progress(
-        SpinnerColumn(), TextColumn("[progress.description]{task.description}")
-    ) as progress:
-        task = progress.add_task("[cyan]Detecting suspicious patterns...", total=None)
-        patterns = get_suspicious_patterns(pcap_file)
-        progress.update(task, completed=True)
-
     if patterns:
         report_lines.append("⚡ SUSPICIOUS PATTERNS DETECTED")
         report_lines.append("-" * 80)
@@ -630,13 +950,12 @@ def generate_report(pcap_file: str, output_dir: str) -> str:
         output_dir, "pcap_analysis", ".txt", is_ai=False
     )
 
-    with open(report_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(report_lines))
+    with open(report_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(f"{line}\n" for line in report_lines)
 
-    # Display report
+    # Display report in one write rather than one print per line
     console.print("\n[bold green]═══ Analysis Complete ═══[/bold green]\n")
-    for line in report_lines:
-        print(line)
+    print("\n".join(report_lines))
 
     console.print(f"\n[bold cyan]📄 Report saved to: {report_file}[/bold cyan]")
 
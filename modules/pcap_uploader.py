@@ -1,90 +1,165 @@
 # PCAP File Upload and Management Module
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from rich import print
+from config import get_config
 
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../upload")
+# File name suffixes accepted as captures
+_PCAP_EXTS = (".pcap", ".pcapng")
+
+
+def _upload_dir():
+    """Upload directory from the current settings (config.json may move it)."""
+    return get_config().upload_dir
+
+
+def _scan_pcap_files(upload_dir):
+    """
+    Return (name, size) pairs for PCAP files in the upload directory.
+
+    Not cached: the directory mtime does not change when a capture is
+    overwritten in place, and one scandir pass is cheap anyway.
+    """
+    with os.scandir(upload_dir) as entries:
+        return [
+            (entry.name, entry.stat().st_size)
+            for entry in entries
+            if entry.name.endswith(_PCAP_EXTS) and entry.is_file()
+        ]
 
 
 def list_files():
     """List all PCAP files in the upload directory."""
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
-    files = [
-        f
-        for f in os.listdir(UPLOAD_DIR)
-        if f.endswith(".pcap") or f.endswith(".pcapng")
-    ]
+    upload_dir = _upload_dir()
+    os.makedirs(upload_dir, exist_ok=True)
+    listing = _scan_pcap_files(upload_dir)
+    files = [name for name, _ in listing]
     if not files:
         print("[yellow]No .pcap or .pcapng files found.[/yellow]")
     else:
         print("\n[bold cyan]Uploaded PCAP Files:[/bold cyan]")
-        for idx, f in enumerate(files, 1):
-            file_path = os.path.join(UPLOAD_DIR, f)
-            file_size = os.path.getsize(file_path)
+        for idx, (f, file_size) in enumerate(listing, 1):
             size_mb = file_size / (1024 * 1024)
             print(f"  [green]{idx}.[/green] {f} [dim]({size_mb:.2f} MB)[/dim]")
     return files
 
 
-def upload_file():
-    """Upload a PCAP file to the upload directory."""
+def upload_file(src, overwrite=False):
+    """
+    Copy a PCAP file into the upload directory.
+
+    Args:
+        src: Path to the .pcap or .pcapng file
+        overwrite: Replace an uploaded file with the same name
+
+    Returns:
+        tuple: (destination path, None) on success, (None, error message)
+        otherwise
+    """
+    if not os.path.isfile(src):
+        return None, "File does not exist."
+    if not src.endswith(_PCAP_EXTS):
+        return None, "Only .pcap or .pcapng files are allowed."
+    upload_dir = _upload_dir()
+    os.makedirs(upload_dir, exist_ok=True)
+    dest = os.path.join(upload_dir, os.path.basename(src))
+    if not overwrite and os.path.exists(dest):
+        return None, "A file with this name already exists."
+    try:
+        shutil.copy2(src, dest)
+    except Exception as e:
+        return None, f"Error uploading file: {e}"
+    return dest, None
+
+
+def upload_many(paths, overwrite=False, max_workers=4):
+    """
+    Upload several PCAP files concurrently.
+
+    Args:
+        paths: Paths of the files to upload
+        overwrite: Replace uploaded files with the same name
+        max_workers: Number of copies running at once
+
+    Returns:
+        list: (destination path, error message) per path, in input order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda src: upload_file(src, overwrite), paths))
+
+
+def prompt_upload_file():
+    """Ask for a PCAP file and upload it."""
     src = input("Enter the path to the .pcap or .pcapng file to upload: ").strip()
 
     # Remove quotes if present
     src = src.strip('"').strip("'")
 
-    if not os.path.isfile(src):
-        print("[bold red]✗ File does not exist.[/bold red]")
-        return
-    if not (src.endswith(".pcap") or src.endswith(".pcapng")):
-        print("[bold red]✗ Only .pcap or .pcapng files are allowed.[/bold red]")
-        return
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
-    dest = os.path.join(UPLOAD_DIR, os.path.basename(src))
-    if os.path.exists(dest):
+    overwrite = False
+    if os.path.exists(os.path.join(_upload_dir(), os.path.basename(src))):
         print("[yellow]A file with this name already exists.[/yellow]")
-        overwrite = input("Do you want to overwrite it? (y/n): ").strip().lower()
-        if overwrite != "y":
+        if input("Do you want to overwrite it? (y/n): ").strip().lower() != "y":
             print("[cyan]Upload cancelled.[/cyan]")
             return
+        overwrite = True
+
+    dest, error = upload_file(src, overwrite=overwrite)
+    if error:
+        print(f"[bold red]✗ {error}[/bold red]")
+        return
+    size_mb = os.path.getsize(dest) / (1024 * 1024)
+    print(
+        f"[bold green]✓ Uploaded {os.path.basename(src)} ({size_mb:.2f} MB)[/bold green]"
+    )
+
+
+def delete_file(name):
+    """
+    Delete a PCAP file from the upload directory.
+
+    Args:
+        name: File name as returned by list_files
+
+    Returns:
+        str: Error message, or None if the file was deleted
+    """
+    if os.path.basename(name) != name:
+        return "Invalid file name."
     try:
-        shutil.copy2(src, dest)
-        file_size = os.path.getsize(dest)
-        size_mb = file_size / (1024 * 1024)
-        print(
-            f"[bold green]✓ Uploaded {os.path.basename(src)} ({size_mb:.2f} MB)[/bold green]"
-        )
+        os.remove(os.path.join(_upload_dir(), name))
+    except FileNotFoundError:
+        return f"{name} does not exist."
     except Exception as e:
-        print(f"[bold red]✗ Error uploading file: {e}[/bold red]")
+        return f"Error deleting file: {e}"
+    return None
 
 
-def delete_file():
-    """Delete a PCAP file from the upload directory."""
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
+def prompt_delete_file():
+    """List the uploaded PCAP files and delete the one the user picks."""
     files = list_files()
     if not files:
         return
     try:
         idx = int(input("\nEnter the number of the file to delete: "))
-        if 1 <= idx <= len(files):
-            file_to_delete = files[idx - 1]
-            file_path = os.path.join(UPLOAD_DIR, file_to_delete)
-            confirm = (
-                input(f"Are you sure you want to delete '{file_to_delete}'? (y/n): ")
-                .strip()
-                .lower()
-            )
-            if confirm == "y":
-                os.remove(file_path)
-                print(f"[bold green]✓ Deleted {file_to_delete}[/bold green]")
-            else:
-                print("[cyan]Deletion cancelled.[/cyan]")
-        else:
-            print("[bold red]✗ Invalid selection.[/bold red]")
     except ValueError:
         print("[bold red]✗ Invalid input. Please enter a number.[/bold red]")
-    except Exception as e:
-        print(f"[bold red]✗ Error deleting file: {e}[/bold red]")
+        return
+    if not 1 <= idx <= len(files):
+        print("[bold red]✗ Invalid selection.[/bold red]")
+        return
+
+    file_to_delete = files[idx - 1]
+    confirm = (
+        input(f"Are you sure you want to delete '{file_to_delete}'? (y/n): ")
+        .strip()
+        .lower()
+    )
+    if confirm != "y":
+        print("[cyan]Deletion cancelled.[/cyan]")
+        return
+    error = delete_file(file_to_delete)
+    if error:
+        print(f"[bold red]✗ {error}[/bold red]")
+    else:
+        print(f"[bold green]✓ Deleted {file_to_delete}[/bold green]")
@@ -3,14 +3,43 @@ Report management utilities - view, delete, and organize reports
 """
 
 import os
+import re
 import shutil
 from rich import print
 from rich.table import Table
 from rich.console import Console
 from datetime import datetime
+from modules.report_numbering import COUNTER_FILENAME
 
 console = Console()
 
+# Report table columns: (header, style, width, justify)
+_TABLE_COLS = (
+    ("#", "dim", 4, "left"),
+    ("Filename", "green", None, "left"),
+    ("Size", "cyan", None, "right"),
+    ("Modified", "yellow", None, "left"),
+)
+
+# Files in the report tree that are not reports; other dotfiles are skipped
+# too, as they hold metadata
+_IGNORED = frozenset({COUNTER_FILENAME})
+
+# Filenames of PCAP reports and AI reports, which are filed under pcap_analysis
+_PCAP_RE = re.compile(r"pcap|ai_report", re.IGNORECASE)
+
+_REPORT_MENU = "\n".join(
+    [
+        "\n[bold magenta]════ Report Management ════[/bold magenta]",
+        "  [cyan]1.[/cyan] View All Reports",
+        "  [cyan]2.[/cyan] Delete Specific Report",
+        "  [cyan]3.[/cyan] Delete by Category",
+        "  [cyan]4.[/cyan] Delete Old Reports (>30 days)",
+        "  [cyan]5.[/cyan] Delete All Reports",
+        "  [cyan]6.[/cyan] Back to Main Menu",
+    ]
+)
+
 
 def organize_reports(report_dir):
     """Organize reports into subdirectories by type."""
@@ -26,14 +55,50 @@ def organize_reports(report_dir):
 
 def get_report_category(filename):
     """Determine report category based on filename."""
-    filename_lower = filename.lower()
-
-    if "pcap" in filename_lower or "ai_report" in filename_lower:
-        # AI reports for PCAP go in pcap_analysis
-        return "pcap_analysis"
-    else:
-        # Log analysis and AI log reports go in log_analysis
-        return "log_analysis"
+    # AI reports for PCAP go in pcap_analysis; log analysis reports go in
+    # log_analysis
+    return "pcap_analysis" if _PCAP_RE.search(filename) else "log_analysis"
+
+
+def _is_report(entry):
+    """Check whether a directory entry is a report file (not metadata)."""
+    name = entry.name
+    return not (name in _IGNORED or name.startswith(".")) and entry.is_file()
+
+
+def _report_info(entry):
+    """Build the report record for one directory entry."""
+    st = entry.stat()
+    return {
+        "name": entry.name,
+        "path": entry.path,
+        "size": st.st_size / 1024,  # KB
+        "modified": datetime.fromtimestamp(st.st_mtime),
+    }
+
+
+def _scan_dir(directory):
+    """
+    Read a directory once, splitting its entries into files and directories.
+
+    Files are returned in inode order: stat-ing them in that order rather
+    than readdir order keeps the inode table reads sequential on cold-cache
+    spinning disks. entry.inode() comes from readdir on POSIX, so the
+    ordering costs no extra syscalls there.
+
+    Returns:
+        tuple: (file entries, subdirectory entries)
+    """
+    files = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if _is_report(entry):
+                files.append(entry)
+            elif entry.is_dir():
+                subdirs.append(entry)
+    files.sort(key=os.DirEntry.inode)
+    return files, subdirs
 
 
 def list_reports_by_category(report_dir):
@@ -44,47 +109,40 @@ def list_reports_by_category(report_dir):
 
     reports = {"log_analysis": [], "pcap_analysis": []}
 
-    # Check main directory
-    for filename in os.listdir(report_dir):
-        filepath = os.path.join(report_dir, filename)
-        if os.path.isfile(filepath):
-            category = get_report_category(filename)
-            file_size = os.path.getsize(filepath) / 1024  # KB
-            file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-            reports[category].append(
-                {
-                    "name": filename,
-                    "path": filepath,
-                    "size": file_size,
-                    "modified": file_time,
-                }
-            )
+    # Check main directory (scandir entries carry their type and cache stat)
+    files, subdirs = _scan_dir(report_dir)
+    for entry in files:
+        category = get_report_category(entry.name)
+        reports[category].append(_report_info(entry))
 
-    # Check subdirectories
-    for category in ["log_analysis", "pcap_analysis"]:
-        subdir = os.path.join(report_dir, category)
-        if os.path.exists(subdir):
-            for filename in os.listdir(subdir):
-                filepath = os.path.join(subdir, filename)
-                if os.path.isfile(filepath):
-                    file_size = os.path.getsize(filepath) / 1024
-                    file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-                    reports[category].append(
-                        {
-                            "name": filename,
-                            "path": filepath,
-                            "size": file_size,
-                            "modified": file_time,
-                        }
-                    )
-
-    # Sort by modified time (newest first)
+    # Descend into the category subdirectories found by the same scan
+    for subdir in subdirs:
+        if subdir.name in reports:
+            reports[subdir.name].extend(map(_report_info, _scan_dir(subdir.path)[0]))
+
+    # Sort by modified time (newest first), once every stat is done
     for category in reports:
         reports[category].sort(key=lambda x: x["modified"], reverse=True)
 
     return reports
 
 
+def _build_report_table(reports):
+    """Build the table listing one category's reports."""
+    table = Table(show_header=True, header_style="bold cyan")
+    for header, style, width, justify in _TABLE_COLS:
+        table.add_column(header, style=style, width=width, justify=justify)
+
+    for idx, report in enumerate(reports, 1):
+        table.add_row(
+            str(idx),
+            report["name"],
+            f"{report['size']:.2f} KB",
+            report["modified"].strftime("%Y-%m-%d %H:%M"),
+        )
+    return table
+
+
 def display_reports(report_dir):
     """Display reports in a formatted table."""
     reports = list_reports_by_category(report_dir)
@@ -108,21 +166,7 @@ def display_reports(report_dir):
                 f"\n[bold yellow]{display_name}[/bold yellow] ({len(reports[category])} files)"
             )
 
-            table = Table(show_header=True, header_style="bold cyan")
-            table.add_column("#", style="dim", width=4)
-            table.add_column("Filename", style="green")
-            table.add_column("Size", justify="right", style="cyan")
-            table.add_column("Modified", style="yellow")
-
-            for idx, report in enumerate(reports[category], 1):
-                table.add_row(
-                    str(idx),
-                    report["name"],
-                    f"{report['size']:.2f} KB",
-                    report["modified"].strftime("%Y-%m-%d %H:%M"),
-                )
-
-            console.print(table)
+            console.print(_build_report_table(reports[category]))
 
     return reports
 
@@ -136,215 +180,289 @@ def delete_report(report_path):
         return False, str(e)
 
 
-def delete_reports_by_category(report_dir, category):
-    """Delete all reports in a specific category."""
-    reports = list_reports_by_category(report_dir)
+def _iter_report_files(report_dir, category=None):
+    """
+    Yield the directory entry of every report file, straight from os.scandir.
+
+    Args:
+        report_dir: Base report directory
+        category: Only yield reports of this category (all if None)
+    """
+    categories = [category] if category else ["log_analysis", "pcap_analysis"]
+    if not os.path.isdir(report_dir):
+        return
+
+    with os.scandir(report_dir) as entries:
+        for entry in entries:
+            if _is_report(entry) and get_report_category(entry.name) in categories:
+                yield entry
+
+    for name in categories:
+        subdir = os.path.join(report_dir, name)
+        if os.path.isdir(subdir):
+            with os.scandir(subdir) as entries:
+                for entry in entries:
+                    if _is_report(entry):
+                        yield entry
 
-    if not reports[category]:
-        return 0, "No reports in this category"
 
+def _delete_files(files):
+    """
+    Delete (name, path) pairs.
+
+    Returns:
+        tuple: (number deleted, list of error messages)
+    """
     count = 0
     errors = []
-
-    for report in reports[category]:
-        success, error = delete_report(report["path"])
-        if success:
+    for name, path in files:
+        try:
+            os.unlink(path)
             count += 1
-        else:
-            errors.append(f"{report['name']}: {error}")
+        except OSError as e:
+            errors.append(f"{name}: {e}")
+    return count, errors
+
+
+def delete_reports_by_category(report_dir, category, reports=None):
+    """
+    Delete all reports in a specific category.
+
+    Args:
+        report_dir: Base report directory
+        category: 'log_analysis' or 'pcap_analysis'
+        reports: Listing from list_reports_by_category (files are streamed
+            from the directory if None)
+    """
+    if reports is not None:
+        files = ((report["name"], report["path"]) for report in reports[category])
+    else:
+        files = (
+            (entry.name, entry.path)
+            for entry in _iter_report_files(report_dir, category)
+        )
 
+    count, errors = _delete_files(files)
     if errors:
         return count, "; ".join(errors)
+    if count == 0:
+        return 0, "No reports in this category"
     return count, None
 
 
-def delete_all_reports(report_dir):
-    """Delete all reports."""
-    reports = list_reports_by_category(report_dir)
+def delete_all_reports(report_dir, reports=None):
+    """
+    Delete all reports.
+
+    Args:
+        report_dir: Base report directory
+        reports: Listing from list_reports_by_category (files are streamed
+            from the directory if None)
+    """
+    if reports is not None:
+        files = (
+            (report["name"], report["path"])
+            for category in reports
+            for report in reports[category]
+        )
+    else:
+        files = ((entry.name, entry.path) for entry in _iter_report_files(report_dir))
 
-    total = sum(len(reports[cat]) for cat in reports)
-    if total == 0:
+    count, errors = _delete_files(files)
+    if errors:
+        return count, "; ".join(errors)
+    if count == 0:
         return 0, "No reports to delete"
+    return count, None
 
-    count = 0
-    errors = []
 
-    for category in reports:
-        for report in reports[category]:
-            success, error = delete_report(report["path"])
-            if success:
-                count += 1
-            else:
-                errors.append(f"{report['name']}: {error}")
+def delete_old_reports(report_dir, days=30, reports=None):
+    """
+    Delete reports older than specified days.
+
+    Args:
+        report_dir: Base report directory
+        days: Age in days above which reports are deleted
+        reports: Listing from list_reports_by_category (files are streamed
+            from the directory if None)
+    """
+    from datetime import timedelta
 
+    cutoff_date = datetime.now() - timedelta(days=days)
+    if reports is not None:
+        files = (
+            (report["name"], report["path"])
+            for category in reports
+            for report in reports[category]
+            if report["modified"] < cutoff_date
+        )
+    else:
+        # Compare raw timestamps rather than building a datetime per file
+        cutoff_ts = cutoff_date.timestamp()
+        files = (
+            (entry.name, entry.path)
+            for entry in _iter_report_files(report_dir)
+            if entry.stat().st_mtime < cutoff_ts
+        )
+
+    count, errors = _delete_files(files)
     if errors:
         return count, "; ".join(errors)
     return count, None
 
 
-def delete_old_reports(report_dir, days=30):
-    """Delete reports older than specified days."""
-    from datetime import timedelta
+def _print_delete_result(count, error, done_message):
+    """Print the outcome of a bulk deletion."""
+    if error:
+        print(f"[yellow]⚠ Deleted {count} reports with errors: {error}[/yellow]")
+    else:
+        print(f"[green]✓ {done_message}[/green]")
 
-    reports = list_reports_by_category(report_dir)
-    cutoff_date = datetime.now() - timedelta(days=days)
 
-    count = 0
-    errors = []
+def cmd_list(report_dir):
+    """Menu action: view all reports."""
+    display_reports(report_dir)
+    input("\nPress Enter to continue...")
 
-    for category in reports:
-        for report in reports[category]:
-            if report["modified"] < cutoff_date:
+
+def cmd_delete_by_num(report_dir):
+    """Menu action: pick one report by number and delete it."""
+    reports = display_reports(report_dir)
+    total = sum(len(reports[cat]) for cat in reports)
+
+    if total == 0:
+        input("\nPress Enter to continue...")
+        return
+
+    # Create a flat list of all reports
+    all_reports = []
+    for category in ["log_analysis", "pcap_analysis"]:
+        all_reports.extend(reports[category])
+
+    try:
+        report_num = int(
+            input("\nEnter report number to delete (0 to cancel): ").strip()
+        )
+        if report_num == 0:
+            return
+        if 1 <= report_num <= len(all_reports):
+            report = all_reports[report_num - 1]
+            confirm = input(f"Delete '{report['name']}'? (y/n): ").strip().lower()
+            if confirm == "y":
                 success, error = delete_report(report["path"])
                 if success:
-                    count += 1
+                    print(f"[green]✓ Deleted: {report['name']}[/green]")
                 else:
-                    errors.append(f"{report['name']}: {error}")
+                    print(f"[red]✗ Error: {error}[/red]")
+        else:
+            print("[red]Invalid report number[/red]")
+    except ValueError:
+        print("[red]Invalid input[/red]")
+
+    input("\nPress Enter to continue...")
+
+
+def cmd_delete_category(report_dir):
+    """Menu action: delete every report of one category."""
+    print("\n[bold]Select Category:[/bold]")
+    print("  [cyan]1.[/cyan] Log Analysis Reports (including AI)")
+    print("  [cyan]2.[/cyan] PCAP Analysis Reports (including AI)")
+
+    cat_choice = input("\nEnter choice (1-2): ").strip()
+    category_map = {
+        "1": "log_analysis",
+        "2": "pcap_analysis",
+    }
+
+    if cat_choice in category_map:
+        category = category_map[cat_choice]
+        reports = list_reports_by_category(report_dir)
+        confirm = (
+            input(
+                f"Delete all {len(reports.get(category, []))} reports in this category? (y/n): "
+            )
+            .strip()
+            .lower()
+        )
+        if confirm == "y":
+            count, error = delete_reports_by_category(
+                report_dir, category, reports=reports
+            )
+            _print_delete_result(count, error, f"Deleted {count} reports")
+    else:
+        print("[red]Invalid choice[/red]")
 
-    if errors:
-        return count, "; ".join(errors)
-    return count, None
+    input("\nPress Enter to continue...")
+
+
+def cmd_delete_old(report_dir):
+    """Menu action: delete reports older than a number of days."""
+    try:
+        days = int(
+            input("Delete reports older than how many days? (default 30): ").strip()
+            or "30"
+        )
+        confirm = (
+            input(f"Delete reports older than {days} days? (y/n): ").strip().lower()
+        )
+        if confirm == "y":
+            count, error = delete_old_reports(report_dir, days)
+            _print_delete_result(count, error, f"Deleted {count} old reports")
+    except ValueError:
+        print("[red]Invalid number[/red]")
+
+    input("\nPress Enter to continue...")
+
+
+def cmd_delete_all(report_dir):
+    """Menu action: delete every report after confirmation."""
+    reports = list_reports_by_category(report_dir)
+    total = sum(len(reports[cat]) for cat in reports)
+
+    if total == 0:
+        print("[yellow]No reports to delete[/yellow]")
+    else:
+        confirm = (
+            input(
+                f"[bold red]Delete ALL {total} reports? This cannot be undone! (yes/no): [/bold red]"
+            )
+            .strip()
+            .lower()
+        )
+        if confirm == "yes":
+            count, error = delete_all_reports(report_dir, reports=reports)
+            if error:
+                print(
+                    f"[yellow]⚠ Deleted {count}/{total} reports with errors: {error}[/yellow]"
+                )
+            else:
+                print(f"[green]✓ Deleted all {count} reports[/green]")
+        else:
+            print("[yellow]Deletion cancelled[/yellow]")
+
+    input("\nPress Enter to continue...")
+
+
+# Report menu choices and the action each one runs
+_MENU_ACTIONS = {
+    "1": cmd_list,
+    "2": cmd_delete_by_num,
+    "3": cmd_delete_category,
+    "4": cmd_delete_old,
+    "5": cmd_delete_all,
+}
 
 
 def manage_reports_menu(report_dir):
     """Interactive report management menu."""
     while True:
         try:
-            print("\n[bold magenta]════ Report Management ════[/bold magenta]")
-            print("  [cyan]1.[/cyan] View All Reports")
-            print("  [cyan]2.[/cyan] Delete Specific Report")
-            print("  [cyan]3.[/cyan] Delete by Category")
-            print("  [cyan]4.[/cyan] Delete Old Reports (>30 days)")
-            print("  [cyan]5.[/cyan] Delete All Reports")
-            print("  [cyan]6.[/cyan] Back to Main Menu")
+            print(_REPORT_MENU)
 
             choice = input("\n[?] Enter your choice (1-6): ").strip()
 
-            if choice == "1":
-                display_reports(report_dir)
-                input("\nPress Enter to continue...")
-
-            elif choice == "2":
-                reports = display_reports(report_dir)
-                total = sum(len(reports[cat]) for cat in reports)
-
-                if total == 0:
-                    input("\nPress Enter to continue...")
-                    continue
-
-                # Create a flat list of all reports
-                all_reports = []
-                for category in ["log_analysis", "ai_analysis", "pcap_analysis"]:
-                    all_reports.extend(reports[category])
-
-                try:
-                    report_num = int(
-                        input("\nEnter report number to delete (0 to cancel): ").strip()
-                    )
-                    if report_num == 0:
-                        continue
-                    if 1 <= report_num <= len(all_reports):
-                        report = all_reports[report_num - 1]
-                        confirm = (
-                            input(f"Delete '{report['name']}'? (y/n): ").strip().lower()
-                        )
-                        if confirm == "y":
-                            success, error = delete_report(report["path"])
-                            if success:
-                                print(f"[green]✓ Deleted: {report['name']}[/green]")
-                            else:
-                                print(f"[red]✗ Error: {error}[/red]")
-                    else:
-                        print("[red]Invalid report number[/red]")
-                except ValueError:
-                    print("[red]Invalid input[/red]")
-
-                input("\nPress Enter to continue...")
-
-            elif choice == "3":
-                print("\n[bold]Select Category:[/bold]")
-                print("  [cyan]1.[/cyan] Log Analysis Reports (including AI)")
-                print("  [cyan]2.[/cyan] PCAP Analysis Reports (including AI)")
-
-                cat_choice = input("\nEnter choice (1-2): ").strip()
-                category_map = {
-                    "1": "log_analysis",
-                    "2": "pcap_analysis",
-                }
-
-                if cat_choice in category_map:
-                    category = category_map[cat_choice]
-                    confirm = (
-                        input(f"Delete all reports in this category? (y/n): ")
-                        .strip()
-                        .lower()
-                    )
-                    if confirm == "y":
-                        count, error = delete_reports_by_category(report_dir, category)
-                        if error:
-                            print(
-                                f"[yellow]⚠ Deleted {count} reports with errors: {error}[/yellow]"
-                            )
-                        else:
-                            print(f"[green]✓ Deleted {count} reports[/green]")
-                else:
-                    print("[red]Invalid choice[/red]")
-
-                input("\nPress Enter to continue...")
-
-            elif choice == "4":
-                try:
-                    days = int(
-                        input(
-                            "Delete reports older than how many days? (default 30): "
-                        ).strip()
-                        or "30"
-                    )
-                    confirm = (
-                        input(f"Delete reports older than {days} days? (y/n): ")
-                        .strip()
-                        .lower()
-                    )
-                    if confirm == "y":
-                        count, error = delete_old_reports(report_dir, days)
-                        if error:
-                            print(
-                                f"[yellow]⚠ Deleted {count} reports with errors: {error}[/yellow]"
-                            )
-                        else:
-                            print(f"[green]✓ Deleted {count} old reports[/green]")
-                except ValueError:
-                    print("[red]Invalid number[/red]")
-
-                input("\nPress Enter to continue...")
-
-            elif choice == "5":
-                reports = list_reports_by_category(report_dir)
-                total = sum(len(reports[cat]) for cat in reports)
-
-                if total == 0:
-                    print("[yellow]No reports to delete[/yellow]")
-                else:
-                    confirm = (
-                        input(
-                            f"[bold red]Delete ALL {total} reports? This cannot be undone! (yes/no): [/bold red]"
-                        )
-                        .strip()
-                        .lower()
-                    )
-                    if confirm == "yes":
-                        count, error = delete_all_reports(report_dir)
-                        if error:
-                            print(
-                                f"[yellow]⚠ Deleted {count}/{total} reports with errors: {error}[/yellow]"
-                            )
-                        else:
-                            print(f"[green]✓ Deleted all {count} reports[/green]")
-                    else:
-                        print("[yellow]Deletion cancelled[/yellow]")
-
-                input("\nPress Enter to continue...")
-
+            if choice in _MENU_ACTIONS:
+                _MENU_ACTIONS[choice](report_dir)
             elif choice == "6":
                 return
             else:
@@ -356,3 +474,54 @@ def manage_reports_menu(report_dir):
         except Exception as e:
             print(f"[red]Error: {str(e)}[/red]")
             input("\nPress Enter to continue...")
+
+
+def main(argv=None):
+    """
+    Run one report management action from the command line, without prompts.
+
+    Example:
+        python -m modules.report_manager --delete-old 30
+    """
+    import argparse
+    from config import get_config
+
+    parser = argparse.ArgumentParser(
+        prog="python -m modules.report_manager",
+        description="View or delete generated reports.",
+    )
+    parser.add_argument(
+        "--report-dir", help="Report directory (defaults to the configured one)"
+    )
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--list", action="store_true", help="list all reports")
+    action.add_argument(
+        "--delete-old", type=int, metavar="DAYS", help="delete reports older than DAYS"
+    )
+    action.add_argument(
+        "--delete-category",
+        choices=["log_analysis", "pcap_analysis"],
+        help="delete every report of a category",
+    )
+    action.add_argument("--delete-all", action="store_true", help="delete all reports")
+    args = parser.parse_args(argv)
+
+    report_dir = args.report_dir or get_config().report_dir
+    if args.list:
+        display_reports(report_dir)
+        return 0
+
+    if args.delete_old is not None:
+        count, error = delete_old_reports(report_dir, args.delete_old)
+        _print_delete_result(count, error, f"Deleted {count} old reports")
+    elif args.delete_category:
+        count, error = delete_reports_by_category(report_dir, args.delete_category)
+        _print_delete_result(count, error, f"Deleted {count} reports")
+    else:
+        count, error = delete_all_reports(report_dir)
+        _print_delete_result(count, error, f"Deleted all {count} reports")
+    return 1 if error else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
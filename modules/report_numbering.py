@@ -5,26 +5,32 @@ Report numbering utilities - manage sequential report numbers
 import os
 import json
 import re
+import atexit
+
+# Per-category counters, kept at the top of the report directory
+COUNTER_FILENAME = ".report_counter.json"
+
+# Counters per report directory, loaded once: {"counters", "mtime", "dirty"}.
+# "mtime" is the counter file's mtime when last read or written, so changes
+# made by another process are picked up.
+_COUNTERS = {}
 
 
 def get_report_counter_file(report_dir):
     """Get path to the report counter file."""
-    return os.path.join(report_dir, ".report_counter.json")
+    return os.path.join(report_dir, COUNTER_FILENAME)
 
 
 def load_counters(report_dir):
     """Load report counters from file."""
     counter_file = get_report_counter_file(report_dir)
 
-    if os.path.exists(counter_file):
-        try:
-            with open(counter_file, "r") as f:
-                return json.load(f)
-        except:
-            pass
-
-    # Default counters
-    return {"log_analysis": 0, "pcap_analysis": 0}
+    # Open directly; a missing or corrupt file means fresh counters
+    try:
+        with open(counter_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"log_analysis": 0, "pcap_analysis": 0}
 
 
 def save_counters(report_dir, counters):
@@ -37,10 +43,75 @@ def save_counters(report_dir, counters):
         print(f"[yellow]Warning: Could not save counters: {e}[/yellow]")
 
 
+def _counter_mtime(report_dir):
+    """Return the counter file's mtime, or None if it doesn't exist."""
+    try:
+        return os.stat(get_report_counter_file(report_dir)).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _cached_counters(report_dir):
+    """Return the cached counter entry, reading the file only when it changed."""
+    entry = _COUNTERS.get(report_dir)
+    if entry is None or (
+        not entry["dirty"] and entry["mtime"] != _counter_mtime(report_dir)
+    ):
+        entry = {
+            "counters": load_counters(report_dir),
+            "mtime": _counter_mtime(report_dir),
+            "dirty": False,
+        }
+        _COUNTERS[report_dir] = entry
+    return entry
+
+
+def reserve_report_number(report_dir, category):
+    """
+    Allocate the next report number without writing the counter file.
+
+    The number is saved by flush_counters, at the latest when the process
+    exits.
+
+    Args:
+        report_dir: Base report directory
+        category: 'log_analysis' or 'pcap_analysis'
+
+    Returns:
+        int: Reserved report number
+    """
+    entry = _cached_counters(report_dir)
+    counters = entry["counters"]
+    counters[category] = counters.get(category, 0) + 1
+    entry["dirty"] = True
+    return counters[category]
+
+
+def flush_counters(report_dir=None):
+    """
+    Save reserved report numbers to the counter file.
+
+    Args:
+        report_dir: Report directory to flush (all directories if None)
+    """
+    dirs = [report_dir] if report_dir is not None else list(_COUNTERS)
+    for directory in dirs:
+        entry = _COUNTERS.get(directory)
+        if entry and entry["dirty"]:
+            save_counters(directory, entry["counters"])
+            entry["mtime"] = _counter_mtime(directory)
+            entry["dirty"] = False
+
+
+atexit.register(flush_counters)
+
+
 def get_next_report_number(report_dir, category):
     """
     Get next sequential report number for a category.
 
+    The number is saved right away so a later run can never reuse it.
+
     Args:
         report_dir: Base report directory
         category: 'log_analysis' or 'pcap_analysis'
@@ -48,10 +119,9 @@ def get_next_report_number(report_dir, category):
     Returns:
         int: Next report number
     """
-    counters = load_counters(report_dir)
-    counters[category] = counters.get(category, 0) + 1
-    save_counters(report_dir, counters)
-    return counters[category]
+    report_num = reserve_report_number(report_dir, category)
+    flush_counters(report_dir)
+    return report_num
 
 
 def get_report_filename(report_dir, category, file_extension, is_ai=False):
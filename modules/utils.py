@@ -3,18 +3,56 @@ import json
 import csv
 from datetime import datetime
 from rich import print
+from config import get_config
+
+# Event log columns with few distinct values, stored as pandas categoricals
+LOG_CATEGORY_COLUMNS = ("SourceName", "Computer", "EventCategory")
 
 
 def ensure_dir(path):
     """Ensure directory exists, create if it doesn't."""
     try:
-        if not os.path.exists(path):
-            os.makedirs(path)
-            print(f"[green]✓ Created directory: {path}[/green]")
-        return True
+        # Attempt the create directly instead of checking for the path first
+        os.makedirs(path)
+        print(f"[green]✓ Created directory: {path}[/green]")
+    except FileExistsError:
+        pass
     except Exception as e:
         print(f"[bold red]✗ Error creating directory {path}: {e}[/bold red]")
         return False
+    return True
+
+
+def compact_log_frame(df, utc=False):
+    """
+    Shrink a freshly loaded event log DataFrame.
+
+    Repetitive text columns become categoricals and TimeGenerated is parsed
+    to datetimes once, so later steps don't re-parse it.
+
+    Args:
+        df: DataFrame of events (modified in place)
+        utc: True when the timestamps are UTC (as in .evtx files)
+
+    Returns:
+        The same DataFrame
+    """
+    import pandas as pd
+
+    for column in LOG_CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    if "TimeGenerated" in df.columns:
+        try:
+            df["TimeGenerated"] = pd.to_datetime(
+                df["TimeGenerated"], utc=utc, errors="coerce"
+            )
+        except ValueError:
+            # Mixed UTC offsets (e.g. an exported CSV) only convert as UTC
+            df["TimeGenerated"] = pd.to_datetime(
+                df["TimeGenerated"], utc=True, errors="coerce"
+            )
+    return df
 
 
 def choose_log_file(user_log_dir):
@@ -23,11 +61,15 @@ def choose_log_file(user_log_dir):
 
     # Support multiple log formats
     supported_extensions = [".evtx", ".csv", ".json", ".log"]
-    files = [
-        f
-        for f in os.listdir(user_log_dir)
-        if any(f.lower().endswith(ext) for ext in supported_extensions)
-    ]
+    ext_tuple = tuple(supported_extensions)
+
+    # One scandir pass; entry.stat() supplies the size without another lookup
+    with os.scandir(user_log_dir) as entries:
+        files = [
+            (entry.name, entry.path, entry.stat().st_size)
+            for entry in entries
+            if entry.name.lower().endswith(ext_tuple) and entry.is_file()
+        ]
 
     if not files:
         print(f"[yellow]⚠️ No log files found in {user_log_dir}.[/yellow]")
@@ -36,11 +78,9 @@ def choose_log_file(user_log_dir):
         return None
 
     print("\n[bold underline cyan]Available Log Files:[/bold underline cyan]")
-    for i, f in enumerate(files, start=1):
-        file_path = os.path.join(user_log_dir, f)
-        file_size = os.path.getsize(file_path)
+    for i, (name, _, file_size) in enumerate(files, start=1):
         size_mb = file_size / (1024 * 1024)
-        print(f"  [green]{i}.[/green] {f} [dim]({size_mb:.2f} MB)[/dim]")
+        print(f"  [green]{i}.[/green] {name} [dim]({size_mb:.2f} MB)[/dim]")
 
     while True:
         try:
@@ -51,8 +91,8 @@ def choose_log_file(user_log_dir):
 
             index = int(choice) - 1
             if 0 <= index < len(files):
-                selected_file = os.path.join(user_log_dir, files[index])
-                print(f"[bold green]✓ Selected: {files[index]}[/bold green]")
+                name, selected_file, _ = files[index]
+                print(f"[bold green]✓ Selected: {name}[/bold green]")
                 return selected_file
             else:
                 print("[red]Invalid choice. Please try again.[/red]")
@@ -79,10 +119,12 @@ def save_json_report(df, report_dir, report_number=None):
                 report_dir, "log_analysis", ".json", is_ai=False
             )
 
-        # Convert DataFrame to JSON
-        df.to_json(output_path, orient="records", indent=2, date_format="iso")
+        # Convert DataFrame to JSON, taking the size from the open handle
+        with open(output_path, "w", encoding="utf-8") as f:
+            df.to_json(f, orient="records", indent=2, date_format="iso")
+            f.flush()
+            file_size = os.fstat(f.fileno()).st_size
 
-        file_size = os.path.getsize(output_path)
         size_kb = file_size / 1024
         print(f"[cyan]✓ JSON report saved: {output_path} ({size_kb:.2f} KB)[/cyan]")
         return output_path
@@ -107,15 +149,15 @@ def save_csv_report(df, report_dir, report_number=None):
                 report_dir, "log_analysis", ".csv", is_ai=False
             )
 
-        # Remove RawXML column if it exists (too large for CSV)
-        if "RawXML" in df.columns:
-            df_export = df.drop(columns=["RawXML"])
-        else:
-            df_export = df
-
-        df_export.to_csv(output_path, index=False, encoding="utf-8")
+        # Leave out the RawXML column if it exists (too large for CSV) by
+        # selecting columns at write time rather than copying the frame
+        with open(output_path, "w", encoding="utf-8", newline="") as f:
+            df.to_csv(
+                f, index=False, columns=df.columns.drop("RawXML", errors="ignore")
+            )
+            f.flush()
+            file_size = os.fstat(f.fileno()).st_size
 
-        file_size = os.path.getsize(output_path)
         size_kb = file_size / 1024
         print(f"[cyan]✓ CSV report saved: {output_path} ({size_kb:.2f} KB)[/cyan]")
         return output_path
@@ -140,24 +182,29 @@ def save_text_summary(findings, report_dir, report_number=None):
                 report_dir, "log_analysis", ".txt", is_ai=False
             )
 
-        with open(output_path, "w", encoding="utf-8") as f:
+        lines = [
             # Header
-            f.write("=" * 80 + "\n")
-            f.write("WINDOWS LOG ANALYSIS REPORT\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
-
+            "=" * 80,
+            "WINDOWS LOG ANALYSIS REPORT",
+            "=" * 80,
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "=" * 80,
+            "",
             # Findings
-            f.write("SECURITY FINDINGS:\n")
-            f.write("-" * 80 + "\n")
-            for line in findings:
-                f.write(f"{line}\n")
-
+            "SECURITY FINDINGS:",
+            "-" * 80,
+            *findings,
             # Footer
-            f.write("\n" + "=" * 80 + "\n")
-            f.write("END OF REPORT\n")
-            f.write("=" * 80 + "\n")
+            "",
+            "=" * 80,
+            "END OF REPORT",
+            "=" * 80,
+            "",
+        ]
+
+        # Write the whole summary in one call
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
 
         print(f"[yellow]✓ Summary saved: {output_path}[/yellow]")
         return output_path
@@ -182,7 +229,7 @@ def save_html_report(df, findings, report_dir, report_number=None):
                 report_dir, "log_analysis", ".html", is_ai=False
             )
 
-        html_content = f"""
+        html_header = f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -250,45 +297,81 @@ def save_html_report(df, findings, report_dir, report_number=None):
         <ul>
 """
 
-        for finding in findings:
-            css_class = ""
-            if "CRITICAL" in finding or "🔴" in finding:
-                css_class = "critical"
-            elif "WARNING" in finding or "⚠️" in finding:
-                css_class = "warning"
-            elif "✅" in finding:
-                css_class = "success"
-
-            html_content += f'            <li class="{css_class}">{finding}</li>\n'
-
-        html_content += """
+        # Stream each part to the file instead of building one big string
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(html_header)
+
+            for finding in findings:
+                css_class = ""
+                if "CRITICAL" in finding or "🔴" in finding:
+                    css_class = "critical"
+                elif "WARNING" in finding or "⚠️" in finding:
+                    css_class = "warning"
+                elif "✅" in finding:
+                    css_class = "success"
+                f.write(f'            <li class="{css_class}">{finding}</li>\n')
+
+            f.write("""
         </ul>
     </div>
     
     <div class="findings">
         <h2>Event Data Summary</h2>
-"""
-
-        # Add table with first 100 rows
-        if not df.empty:
-            df_display = df.head(100)
-            # Remove RawXML for HTML display
-            if "RawXML" in df_display.columns:
-                df_display = df_display.drop(columns=["RawXML"])
-
-            html_content += df_display.to_html(index=False, classes="data-table")
-
-        html_content += """
+""")
+
+            # Add table with first 100 rows (without RawXML)
+            if not df.empty:
+                df.head(100).to_html(
+                    buf=f,
+                    columns=df.columns.drop("RawXML", errors="ignore"),
+                    index=False,
+                    classes="data-table",
+                )
+
+            f.write("""
     </div>
 </body>
 </html>
-"""
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+""")
 
         print(f"[magenta]✓ HTML report saved: {output_path}[/magenta]")
         return output_path
     except Exception as e:
         print(f"[bold red]✗ Error saving HTML report: {e}[/bold red]")
         return None
+
+
+def save_all_reports(df, findings, report_dir, report_number=None):
+    """
+    Save every enabled report format for one analysis.
+
+    Args:
+        df: DataFrame containing the parsed events
+        findings: List of security findings from the analyzer
+        report_dir: Base report directory
+        report_number: Report number shared by all formats (allocated if None)
+
+    Returns:
+        dict: Saved report paths keyed by format
+    """
+    if not report_number:
+        from modules.report_numbering import get_next_report_number
+
+        report_number = get_next_report_number(report_dir, "log_analysis")
+
+    config = get_config()
+    saved = {}
+    if config.enable_json_export:
+        saved["json"] = save_json_report(df, report_dir, report_number=report_number)
+    if config.enable_csv_export:
+        saved["csv"] = save_csv_report(df, report_dir, report_number=report_number)
+    if config.enable_txt_export:
+        saved["txt"] = save_text_summary(
+            findings, report_dir, report_number=report_number
+        )
+    if config.enable_html_export:
+        saved["html"] = save_html_report(
+            df, findings, report_dir, report_number=report_number
+        )
+
+    return saved